@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+
+# Compares convert_tags.py with filter_lft.py on a synthetic lemma-form-tag
+# file built from the tags in slovak_tags.txt plus unconverted l-participle
+# tags, and checks that both produce the same output:
+#
+#   bin/benchmark_convert_tags.py --lines 2000000 --jobs 4
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+BIN_DIR = os.path.dirname(os.path.abspath(__file__))
+TAGS_FILE = os.path.join(BIN_DIR, os.pardir, "slovak_tags.txt")
+LETTERS = "aábcčdďeéfghiíjklĺľmnňoóôpqrŕsštťuúvwxyýzž"
+
+def corpus_tags():
+    """Tags as they appear in the corpus. slovak_tags.txt holds the converted
+    tagset, so its l-participles are replaced by all unconverted ones (person
+    a/b/c and every gender in both numbers) to exercise the VL rules."""
+    with open(TAGS_FILE, encoding='utf-8') as f:
+        tags = [tag.strip() for tag in f if tag.strip() and not tag.startswith(('%', 'VL'))]
+    participles = [f"VL{aspect}{number}{person}{gender}{negation}"
+                   for aspect in "dej" for number in "sp" for person in "abc"
+                   for gender in "mifnho" for negation in "+-"]
+    # About one line in five is an l-participle
+    return tags + participles * (len(tags) // len(participles) // 4 + 1)
+
+def generate(path, lines, seed=1):
+    random.seed(seed)
+    tags = corpus_tags()
+    words = ["".join(random.choices(LETTERS, k=random.randint(3, 12))) for _ in range(50000)]
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(lines):
+            lemma = random.choice(words)
+            form = lemma[:-1] + random.choice(LETTERS)
+            if random.random() < 0.01:
+                form = '*' + form
+            f.write(f"{lemma}\t{form}\t{random.choice(tags)}\n")
+
+def run(command, input_path, output_path):
+    started = time.monotonic()
+    with open(input_path, 'rb') as stdin, open(output_path, 'wb') as stdout:
+        subprocess.run(command, stdin=stdin, stdout=stdout, stderr=subprocess.DEVNULL, check=True)
+    return time.monotonic() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark convert_tags.py against filter_lft.py")
+    parser.add_argument('--lines', type=int, default=2000000, help="lines of synthetic input")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="workers for the parallel runs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "ma.txt")
+        generate(input_path, args.lines)
+        size = os.path.getsize(input_path) / (1 << 20)
+        print(f"{args.lines} lines, {size:.0f} MiB")
+
+        filter_lft = [sys.executable, os.path.join(BIN_DIR, "filter_lft.py")]
+        convert_tags = [sys.executable, os.path.join(BIN_DIR, "convert_tags.py")]
+        runs = [
+            ("filter_lft.py", filter_lft),
+            ("convert_tags.py, stdin", convert_tags),
+            (f"convert_tags.py, stdin, {args.jobs} jobs", convert_tags + ["-j", str(args.jobs)]),
+            ("convert_tags.py, mmap", convert_tags + [input_path]),
+            (f"convert_tags.py, mmap, {args.jobs} jobs", convert_tags + ["-j", str(args.jobs), input_path]),
+        ]
+
+        reference = None
+        baseline = None
+        for index, (name, command) in enumerate(runs):
+            output_path = os.path.join(directory, f"out{index}.txt")
+            elapsed = run(command, input_path, output_path)
+            with open(output_path, 'rb') as f:
+                output = f.read()
+            if reference is None:
+                reference, baseline = output, elapsed
+                same = ""
+            else:
+                same = "" if output == reference else "  OUTPUT DIFFERS"
+            print(f"{name:<36} {elapsed:7.2f}s {args.lines / elapsed / 1e6:6.2f}M lines/s "
+                  f"{baseline / elapsed:5.1f}x{same}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/python3
+
+# Converts the lemma-form-tag lists from the Slovak National Corpus into the
+# form-lemma-tag lists used to build slovak.dict, simplifying the tags on the
+# way (see tagset.txt). Same rules as filter_lft.py, but it works on large
+# blocks of bytes instead of single lines and can use several CPU cores:
+#
+#   xzcat ma.txt.xz | bin/convert_tags.py -j 4 | sort -u --parallel=4 > out.txt
+#   bin/convert_tags.py -j 4 ma.txt -o out.txt     # a plain file is mmapped
+#
+# Lines whose form starts with "*" (erroneous forms) are skipped, lines that
+# don't have exactly three TAB separated fields are reported as malformed.
+
+import os
+import sys
+import mmap
+import argparse
+import multiprocessing
+from collections import deque
+
+DEFAULT_CHUNK_SIZE = 8  # MiB per block
+MAX_EXAMPLES = 10
+
+# (tag prefix, condition as (position, value) or None, position, new value)
+TAG_RULES = (
+    # l-participle: the word forms are the same for all persons
+    (b'VL', None, 4, b'o'),
+    # l-participle plural: the word forms are the same for all genders
+    (b'VL', (3, b'p'), 5, b'o'),
+)
+
+# Each distinct tag is converted once; a corpus only has a few thousand
+converted_tags = {}
+
+def convert_tag(tag):
+    result = converted_tags.get(tag)
+    if result is not None:
+        return result
+    result = bytearray(tag)
+    for prefix, condition, position, value in TAG_RULES:
+        if not tag.startswith(prefix) or len(tag) <= position:
+            continue
+        if condition is not None and tag[condition[0]:condition[0] + 1] != condition[1]:
+            continue
+        result[position:position + 1] = value
+    result = bytes(result)
+    converted_tags[tag] = result
+    return result
+
+def convert_block(data):
+    """Convert a block of complete lines.
+
+    Returns (output, converted, skipped, malformed, examples) where examples
+    are the first few malformed lines.
+    """
+    # Hot loop: locals and slices instead of method lookups and startswith()
+    output = []
+    append = output.append
+    join = b'\t'.join
+    cached_tag = converted_tags.get
+    skipped = 0
+    malformed = 0
+    examples = []
+    for line in data.splitlines():
+        fields = line.strip().split(b'\t')
+        if len(fields) != 3:
+            malformed += 1
+            if len(examples) < MAX_EXAMPLES:
+                examples.append(line)
+            continue
+        lemma, form, tag = fields
+        if form[:1] == b'*':
+            skipped += 1
+            continue
+        if lemma[:1] == b'*':
+            lemma = lemma[1:]
+        append(join((form, lemma, cached_tag(tag) or convert_tag(tag))))
+    block = b'\n'.join(output) + b'\n' if output else b''
+    return block, len(output), skipped, malformed, examples
+
+def read_blocks(stream, chunk_size):
+    """Yield blocks of about chunk_size bytes that end at a line break"""
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            return
+        if not block.endswith(b'\n'):
+            block += stream.readline()
+        yield block
+
+def file_ranges(data, chunk_size):
+    """Split a mapped file into (start, end) ranges that end at a line break"""
+    start = 0
+    while start < len(data):
+        end = data.find(b'\n', start + chunk_size)
+        end = len(data) if end == -1 else end + 1
+        yield start, end
+        start = end
+
+# Workers map the input file themselves so only offsets are sent to them
+mapped_input = None
+
+def map_input(path):
+    global mapped_input
+    with open(path, 'rb') as f:
+        mapped_input = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def convert_range(file_range):
+    start, end = file_range
+    return convert_block(mapped_input[start:end])
+
+def run_parallel(pool, function, tasks, jobs):
+    """Like pool.imap, but keeps only a few blocks in flight so memory use
+    doesn't grow with the input"""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.apply_async(function, (task,)))
+        if len(pending) >= jobs * 2:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+def is_mappable(path):
+    return path not in (None, '-') and os.path.isfile(path) and os.path.getsize(path) > 0
+
+def convert(input_path, output, jobs=1, chunk_size=DEFAULT_CHUNK_SIZE << 20):
+    """Convert input_path (None or "-" for stdin) into the binary stream output.
+
+    Returns (converted, skipped, malformed, examples).
+    """
+    stream = None
+    if is_mappable(input_path):
+        map_input(input_path)
+        tasks = file_ranges(mapped_input, chunk_size)
+        function = convert_range
+        initializer = (map_input, (input_path,))
+    else:
+        stream = open(input_path, 'rb') if input_path not in (None, '-') else sys.stdin.buffer
+        tasks = read_blocks(stream, chunk_size)
+        function = convert_block
+        initializer = (None, ())
+
+    totals = [0, 0, 0]
+    examples = []
+    pool = None
+    try:
+        if jobs > 1:
+            pool = multiprocessing.Pool(jobs, *initializer)
+            results = run_parallel(pool, function, tasks, jobs)
+        else:
+            results = map(function, tasks)
+        for block, *counts, block_examples in results:
+            output.write(block)
+            for index, count in enumerate(counts):
+                totals[index] += count
+            examples.extend(block_examples[:MAX_EXAMPLES - len(examples)])
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        if stream not in (None, sys.stdin.buffer):
+            stream.close()
+    return totals[0], totals[1], totals[2], examples
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert Slovak National Corpus lemma-form-tag lists for the LanguageTool dictionary")
+    parser.add_argument('input', nargs='?', help="TAB separated lemma, form, tag lines (default: stdin)")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes, 0 for one per CPU (default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"MiB per block handed to a worker (default: {DEFAULT_CHUNK_SIZE})")
+    args = parser.parse_args()
+
+    jobs = args.jobs or os.cpu_count()
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        converted, skipped, malformed, examples = convert(
+            args.input, output, jobs, max(1, args.chunk_size) << 20)
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"{converted} lines converted, {skipped} erroneous forms skipped, "
+          f"{malformed} malformed lines", file=sys.stderr)
+    for line in examples:
+        print(f"malformed: {line.decode('utf-8', 'replace')!r}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
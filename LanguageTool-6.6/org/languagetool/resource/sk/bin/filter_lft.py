@@ -18,7 +18,7 @@ for l in sys.stdin:
         if 'p' in tag:
             # neda sa urcit rod
             ntag = re.sub('[hmifno]', 'o', ntag)
-        ntag = re.sub('[abc]', 'o', tag)
+        ntag = re.sub('[abc]', 'o', ntag)
 #    ntag = ntag.replace('+', 'P')
 #    ntag = ntag.replace('-', 'N')
     print (form, lemma, ntag, sep='\t')
@@ -27,7 +27,7 @@ tmp=`tempfile` || exit
 
 trap "rm -f -- '$tmp'" EXIT
 
-xzcat $MA_FILE | bin/filter_lft.py | sort -u --parallel=4 > "$tmp"
+xzcat $MA_FILE | bin/convert_tags.py -j 4 | sort -u --parallel=4 > "$tmp"
 
 head "$tmp"
 
@@ -0,0 +1,15 @@
+"""Shared core for the Flock Native GTK launchers.
+
+flock-simple.py and flock-tray.py are thin profiles over FlockApp; optional
+features live in flock_native.plugins and are only imported when enabled.
+"""
+
+__all__ = ["FlockApp", "run"]
+
+def __getattr__(name):
+    # Imported on first use so the pure Python modules (rules, history, ...)
+    # can be used without GTK and WebKit installed
+    if name in __all__:
+        from . import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
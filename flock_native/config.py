@@ -0,0 +1,73 @@
+import os
+import json
+
+# The launchers and assets live in the repository checkout
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_DIR = os.path.expanduser("~/.config/flock-native")
+CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+DATA_DIR = os.path.expanduser("~/.local/share/flock-native")
+CACHE_DIR = os.path.expanduser("~/.cache/flock-native")
+
+FLOCK_URL = "https://web.flock.com"
+ICON_PATH = os.path.join(APP_DIR, "icon.png")
+
+CHROME_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Defaults for each launcher; config.json is applied on top
+PROFILES = {
+    "simple": {
+        "title": "Flock Chat",
+        "user_agent": CHROME_USER_AGENT,
+        "plugins": {},
+    },
+    "tray": {
+        "title": "Flock",
+        "user_agent": None,
+        "plugins": {
+            "tray": True,
+            "history": True,
+            "notifications": True,
+            "downloads": True,
+            "paste": True,
+            "unread": True,
+            "spelling": True,
+            "grammar": False,
+        },
+    },
+}
+
+def load_config(profile):
+    """Merge ~/.config/flock-native/config.json over the profile defaults, e.g.
+    {"plugins": {"grammar": true, "downloads": false}, "workspaces": [{"name": "Work"}]}
+    """
+    defaults = PROFILES[profile]
+    config = dict(defaults)
+    config["plugins"] = dict(defaults["plugins"])
+
+    user_config = {}
+    if os.path.exists(CONFIG_FILE):
+        try:
+            with open(CONFIG_FILE) as f:
+                user_config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read {CONFIG_FILE}: {e}")
+
+    for key, value in user_config.items():
+        if key == "plugins":
+            config["plugins"].update(value)
+        else:
+            config[key] = value
+    return config
+
+def plugin_options(config, name):
+    """Return the options dict for an enabled plugin, or None if it is disabled.
+
+    A plugin entry is either a bool or a dict of options with an optional
+    "enabled" key.
+    """
+    entry = config["plugins"].get(name, False)
+    if isinstance(entry, dict):
+        if not entry.get("enabled", True):
+            return None
+        return entry
+    return {} if entry else None
@@ -0,0 +1,396 @@
+import os
+import subprocess
+import webbrowser
+from urllib.parse import urlparse
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('WebKit2', '4.0')
+from gi.repository import Gtk, WebKit2, GLib
+
+from .config import FLOCK_URL, ICON_PATH, load_config
+from .workspaces import load_workspaces
+from .plugins import load_plugins
+
+MAX_POPOUT_WINDOWS = 4  # Pop-out conversation windows per workspace
+POPOUT_HOSTS = ('web.flock.com',)
+FLOCK_DOMAINS = ('flock.com', 'web.flock.com', 'flockws.com')
+
+# Send external links to the default browser instead of navigating away
+LINK_INTERCEPTOR_SCRIPT = """
+(function() {
+    document.addEventListener('click', function(e) {
+        let target = e.target;
+        while (target && target.tagName !== 'A') {
+            target = target.parentElement;
+        }
+
+        if (target && target.href) {
+            // Check if it's an external link
+            const url = new URL(target.href);
+            const currentHost = window.location.hostname;
+            if (url.hostname !== currentHost &&
+                !url.hostname.includes('flock.com') &&
+                !url.hostname.includes('flockws.com')) {
+                console.log('External link detected, opening in browser');
+                e.preventDefault();
+                // Create a temporary link with target="_blank" to trigger navigation
+                const tempLink = document.createElement('a');
+                tempLink.href = target.href;
+                tempLink.target = '_blank';
+                tempLink.click();
+                return false;
+            }
+
+            // Check if it's a download link
+            if (target.hasAttribute('download') ||
+                target.href.includes('/download/') ||
+                target.href.includes('download=') ||
+                target.href.match(/\\.(pdf|zip|doc|docx|xls|xlsx|ppt|pptx|rar|7z|tar|gz)$/i)) {
+
+                console.log('Download link clicked:', target.href);
+                // Force navigation to trigger our handler
+                e.preventDefault();
+                window.location.href = target.href;
+            }
+        }
+    }, true);
+
+    console.log('Link interceptor installed');
+})();
+"""
+
+def open_external(uri):
+    try:
+        subprocess.run(['xdg-open', uri], check=True)
+    except (OSError, subprocess.CalledProcessError):
+        # Fallback to webbrowser
+        webbrowser.open(uri)
+
+class FlockApp:
+    """Window, workspaces and WebViews shared by every launcher profile"""
+    def __init__(self, profile):
+        self.profile = profile
+        self.config = load_config(profile)
+
+        self.window = Gtk.Window()
+        self.window.set_title(self.config["title"])
+        self.window.set_default_size(1200, 800)
+        if os.path.exists(ICON_PATH):
+            self.window.set_icon_from_file(ICON_PATH)
+        self.window.connect("destroy", self.quit)
+
+        # One settings object shared by every workspace's WebView
+        self.settings = self.create_settings()
+
+        # Workspaces are loaded lazily; only the first one is loaded at startup
+        self.workspaces, self.suspend_after = load_workspaces(self.config)
+        self.active_workspace = None
+
+        self.stack = Gtk.Stack()
+        self.stack.set_transition_type(Gtk.StackTransitionType.NONE)
+        for workspace in self.workspaces:
+            workspace.container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            self.stack.add_titled(workspace.container, workspace.slug, workspace.name)
+        self.stack.connect("notify::visible-child", self.on_workspace_switched)
+
+        # Only show a workspace switcher when there is something to switch to
+        if len(self.workspaces) > 1:
+            header = Gtk.HeaderBar()
+            header.set_show_close_button(True)
+            switcher = Gtk.StackSwitcher()
+            switcher.set_stack(self.stack)
+            header.set_custom_title(switcher)
+            self.window.set_titlebar(header)
+
+        # Add workspaces to window
+        self.window.add(self.stack)
+
+        # Plugins are created before any WebView so they can hook into all of them
+        self.plugins = load_plugins(self, self.config)
+        for plugin in self.plugins:
+            plugin.on_plugins_loaded()
+
+        # Show window
+        self.window.show_all()
+
+        # Load the first workspace
+        self.switch_workspace(self.workspaces[0])
+
+    def create_settings(self):
+        settings = WebKit2.Settings()
+        settings.set_enable_developer_extras(True)
+        settings.set_enable_javascript(True)
+        settings.set_javascript_can_open_windows_automatically(True)
+        settings.set_allow_file_access_from_file_urls(True)
+
+        # Enable clipboard access
+        settings.set_javascript_can_access_clipboard(True)
+
+        # Enable audio/video
+        settings.set_media_playback_requires_user_gesture(False)
+        settings.set_enable_media(True)
+        settings.set_enable_media_stream(True)
+        settings.set_enable_webaudio(True)
+        settings.set_enable_webgl(True)
+
+        settings.set_enable_write_console_messages_to_stdout(True)
+
+        if self.config.get("user_agent"):
+            settings.set_user_agent(self.config["user_agent"])
+        return settings
+
+    def create_context(self, workspace):
+        if workspace.data_dir:
+            # Separate cookie jar and storage for this workspace
+            data_manager = WebKit2.WebsiteDataManager(
+                base_data_directory=workspace.data_dir,
+                base_cache_directory=workspace.cache_dir
+            )
+            context = WebKit2.WebContext.new_with_website_data_manager(data_manager)
+            cookie_manager = context.get_cookie_manager()
+            cookie_manager.set_persistent_storage(
+                os.path.join(workspace.data_dir, "cookies.sqlite"),
+                WebKit2.CookiePersistentStorage.SQLITE
+            )
+        else:
+            # The first workspace keeps the default storage so existing logins survive
+            context = WebKit2.WebContext.new()
+
+        # Disable ITP to allow cross-site cookies
+        if hasattr(context, 'get_website_data_manager'):
+            data_manager = context.get_website_data_manager()
+            if hasattr(data_manager, 'set_itp_enabled'):
+                data_manager.set_itp_enabled(False)
+
+        # Keep every view of a workspace in a single web process
+        if hasattr(WebKit2, 'ProcessModel') and hasattr(context, 'set_process_model'):
+            context.set_process_model(WebKit2.ProcessModel.SHARED_SECONDARY_PROCESS)
+
+        context.set_cache_model(WebKit2.CacheModel.DOCUMENT_VIEWER)
+
+        # Initialize notification permission
+        context.initialize_notification_permissions([
+            WebKit2.SecurityOrigin.new_for_uri("https://web.flock.com"),
+            WebKit2.SecurityOrigin.new_for_uri("https://flock.com")
+        ], [])
+
+        for plugin in self.plugins:
+            plugin.setup_context(context)
+        return context
+
+    def setup_webview(self, webview, workspace):
+        # Plugin handlers are connected first so they get the first say, e.g.
+        # download links must reach the downloads plugin before core sends
+        # links to other hosts to the browser
+        for plugin in self.plugins:
+            plugin.setup_webview(webview, workspace)
+
+        webview.connect("permission-request", self.on_permission_request)
+        webview.connect("decide-policy", self.on_navigation_decision)
+        webview.connect("context-menu", self.on_context_menu)
+        webview.connect("create", self.on_create_window, workspace)
+        webview.connect("load-changed", self.on_load_changed, workspace)
+
+    def load_workspace(self, workspace):
+        if workspace.context is None:
+            workspace.context = self.create_context(workspace)
+
+        # Create WebView with the workspace context
+        webview = WebKit2.WebView.new_with_context(workspace.context)
+        webview.set_settings(self.settings)
+        self.setup_webview(webview, workspace)
+
+        # Load Flock
+        webview.load_uri(FLOCK_URL)
+
+        workspace.webview = webview
+        workspace.container.pack_start(webview, True, True, 0)
+        webview.show()
+        print(f"Loaded workspace: {workspace.name}")
+
+    def suspend_workspace(self, workspace):
+        workspace.suspend_source = None
+        if workspace is self.active_workspace or workspace.webview is None:
+            return False
+        if workspace.popouts:
+            # Pop-outs share the web process; suspend once they are closed
+            return False
+
+        # Destroying the last view of a context lets its web process exit
+        print(f"Suspending workspace: {workspace.name}")
+        workspace.container.remove(workspace.webview)
+        workspace.webview.destroy()
+        workspace.webview = None
+        return False
+
+    def schedule_suspend(self, workspace):
+        if self.suspend_after > 0 and not workspace.suspend_source:
+            workspace.suspend_source = GLib.timeout_add_seconds(
+                self.suspend_after, self.suspend_workspace, workspace
+            )
+
+    def switch_workspace(self, workspace):
+        if self.stack.get_visible_child() is not workspace.container:
+            # on_workspace_switched takes over from here
+            self.stack.set_visible_child(workspace.container)
+        else:
+            self.activate_workspace(workspace)
+
+    def on_workspace_switched(self, stack, param):
+        container = stack.get_visible_child()
+        for workspace in self.workspaces:
+            if workspace.container is container:
+                self.activate_workspace(workspace)
+                break
+
+    def activate_workspace(self, workspace):
+        previous = self.active_workspace
+        self.active_workspace = workspace
+
+        if workspace.suspend_source:
+            GLib.source_remove(workspace.suspend_source)
+            workspace.suspend_source = None
+        if workspace.webview is None:
+            self.load_workspace(workspace)
+
+        # Suspend the workspace we left once it has been idle for a while
+        if previous and previous is not workspace:
+            self.schedule_suspend(previous)
+
+    def present(self):
+        self.window.show()
+        self.window.present()
+
+    def unread_changed(self):
+        for plugin in self.plugins:
+            plugin.on_unread_changed()
+        return False
+
+    def on_permission_request(self, webview, request):
+        # Allow notification permissions
+        if isinstance(request, WebKit2.NotificationPermissionRequest):
+            request.allow()
+            return True
+        # Allow clipboard permissions
+        if hasattr(WebKit2, 'ClipboardPermissionRequest') and isinstance(request, WebKit2.ClipboardPermissionRequest):
+            request.allow()
+            return True
+        # Allow media permissions (for clipboard paste of images)
+        if hasattr(WebKit2, 'MediaKeySystemPermissionRequest') and isinstance(request, WebKit2.MediaKeySystemPermissionRequest):
+            request.allow()
+            return True
+        return False
+
+    def on_navigation_decision(self, webview, decision, decision_type):
+        if decision_type == WebKit2.PolicyDecisionType.NAVIGATION_ACTION:
+            navigation_action = decision.get_navigation_action()
+            uri = navigation_action.get_request().get_uri()
+            nav_type = navigation_action.get_navigation_type()
+
+            # Handle different types of navigation
+            if nav_type in [WebKit2.NavigationType.LINK_CLICKED,
+                           WebKit2.NavigationType.FORM_SUBMITTED,
+                           WebKit2.NavigationType.OTHER]:
+                # Check if this is an external link (not flock.com)
+                if uri and not uri.startswith('about:') and not any(domain in uri for domain in FLOCK_DOMAINS):
+                    print(f"Opening external link: {uri}")
+                    open_external(uri)
+                    decision.ignore()
+                    return True
+
+        # Let plugins or WebKit handle it
+        return False
+
+    def on_context_menu(self, webview, context_menu, event, hit_test_result):
+        # Debug what was right-clicked
+        if hit_test_result.context_is_link():
+            print(f"Right-clicked on link: {hit_test_result.get_link_uri()}")
+
+        # Let the default context menu appear
+        return False
+
+    def on_create_window(self, webview, navigation_action, workspace):
+        # Handle requests to open new windows (target="_blank" links)
+        uri = navigation_action.get_request().get_uri()
+
+        print(f"New window requested for: {uri}")
+
+        if uri and urlparse(uri).hostname in POPOUT_HOSTS:
+            return self.create_popout(webview, workspace)
+
+        if uri:
+            # Open in default browser
+            open_external(uri)
+
+        # Return None to prevent new window creation
+        return None
+
+    def create_popout(self, webview, workspace):
+        if len(workspace.popouts) >= MAX_POPOUT_WINDOWS:
+            print(f"Pop-out limit reached ({MAX_POPOUT_WINDOWS}), raising the latest window")
+            workspace.popouts[-1].present()
+            return None
+
+        # A related view shares the web process, session and settings of its parent
+        popout_view = WebKit2.WebView.new_with_related_view(webview)
+        self.setup_webview(popout_view, workspace)
+
+        popout = Gtk.Window()
+        popout.set_title("Flock")
+        popout.set_default_size(800, 700)
+        if os.path.exists(ICON_PATH):
+            popout.set_icon_from_file(ICON_PATH)
+        popout.add(popout_view)
+
+        popout_view.connect("notify::title", self.on_popout_title_changed, popout)
+        popout_view.connect("ready-to-show", self.on_popout_ready, popout)
+        popout_view.connect("close", self.on_popout_close, popout)
+        popout.connect("delete-event", self.on_popout_delete, workspace)
+
+        workspace.popouts.append(popout)
+        return popout_view
+
+    def on_popout_title_changed(self, webview, param, popout):
+        title = webview.get_title()
+        popout.set_title(title or "Flock")
+
+    def on_popout_ready(self, webview, popout):
+        popout.show_all()
+        popout.present()
+
+    def on_popout_close(self, webview, popout):
+        # window.close() from the page
+        popout.close()
+
+    def on_popout_delete(self, popout, event, workspace):
+        # Destroy the view so its memory is released instead of hiding it
+        if popout in workspace.popouts:
+            workspace.popouts.remove(popout)
+        popout_view = popout.get_child()
+        if popout_view:
+            popout.remove(popout_view)
+            popout_view.destroy()
+        popout.destroy()
+
+        # A workspace left waiting on its pop-outs can be suspended now
+        if not workspace.popouts and workspace is not self.active_workspace:
+            self.schedule_suspend(workspace)
+        return True
+
+    def on_load_changed(self, webview, load_event, workspace):
+        if load_event == WebKit2.LoadEvent.FINISHED:
+            webview.evaluate_javascript(LINK_INTERCEPTOR_SCRIPT, -1, None, None, None, None)
+
+            for plugin in self.plugins:
+                plugin.on_load_finished(webview, workspace)
+
+    def quit(self, widget=None):
+        for plugin in self.plugins:
+            plugin.shutdown()
+        Gtk.main_quit()
+
+def run(profile):
+    app = FlockApp(profile)
+    Gtk.main()
+    return app
@@ -0,0 +1,194 @@
+import re
+import json
+import socket
+import hashlib
+import http.client
+import urllib.parse
+from collections import OrderedDict
+
+DEFAULT_CACHE_SIZE = 4096  # Cached sentences
+BATCH_SEPARATOR = "\n\n"
+
+# A sentence may end after terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace, and always ends at a line break
+SENTENCE_END = re.compile(r'[.!?…]+["\'”’)\]]*(?=\s)|\n')
+NEXT_WORD = re.compile(r'\s*["\'“‘(\[]*(\w)')
+LAST_WORD = re.compile(r'(\w[\w.]*)$')
+# Words that usually end with a period in the middle of a sentence
+ABBREVIATIONS = {
+    "e.g", "i.e", "cf", "vs", "approx", "fig", "no",
+    "mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr",
+}
+
+def is_sentence_end(text, match):
+    """A break needs an uppercase letter or digit next and no abbreviation
+    before it. Missing a break only costs cache reuse, while a wrong one
+    makes LanguageTool report the fragment as a new sentence."""
+    if match.group() == "\n":
+        return True
+    following = NEXT_WORD.match(text, match.end())
+    if not following or not (following.group(1).isupper() or following.group(1).isdigit()):
+        return False
+    if text[match.start()] != ".":
+        return True
+    word = LAST_WORD.search(text, max(0, match.start() - 32), match.start())
+    if not word:
+        return True
+    word = word.group(1).lower()
+    # Single letters are initials, as in "J. Smith"
+    return word not in ABBREVIATIONS and not (len(word) == 1 and word.isalpha())
+
+def split_sentences(text):
+    """Return (start, sentence) pairs with surrounding whitespace stripped"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        if is_sentence_end(text, match):
+            sentences.append((start, text[start:match.end()]))
+            start = match.end()
+    sentences.append((start, text[start:]))
+
+    result = []
+    for start, segment in sentences:
+        stripped = segment.strip()
+        if stripped:
+            result.append((start + segment.index(stripped), stripped))
+    return result
+
+def utf16_len(text):
+    # LanguageTool (Java) and the page (JavaScript) both count UTF-16 units
+    return len(text.encode('utf-16-le')) // 2
+
+class GrammarClient:
+    """LanguageTool client that only sends sentences it hasn't seen before.
+
+    Text is split into sentences and each sentence's matches are cached by
+    (language, hash). A check sends every uncached sentence in one request
+    over a persistent connection and maps the matches back to offsets in the
+    full text. Offsets are in UTF-16 units like the server's and the page's.
+    Rules that look across sentence boundaries won't fire, which is the price
+    for reusing results.
+
+    Not thread-safe; use it from a single worker thread.
+    """
+    def __init__(self, server_url, cache_size=DEFAULT_CACHE_SIZE, params=None, timeout=10):
+        parsed = urllib.parse.urlparse(server_url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.path = parsed.path.rstrip('/') + "/v2/check"
+        self.https = parsed.scheme == "https"
+        self.timeout = timeout
+        self.params = dict(params or {})
+
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.connection = None
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, sentence, language):
+        digest = hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest()
+        return (language, digest)
+
+    def check(self, text, language):
+        """Return matches as dicts with offset, length, message and replacements.
+
+        Raises OSError or ValueError when the server can't be reached or
+        returns garbage.
+        """
+        sentences = split_sentences(text)
+        results = {}
+        missing = []
+        for start, sentence in sentences:
+            key = self.cache_key(sentence, language)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                results[key] = cached
+                self.hits += 1
+            elif key not in results:
+                results[key] = None
+                missing.append((key, sentence))
+                self.misses += 1
+
+        if missing:
+            for key, matches in zip((key for key, _ in missing), self.check_batch(
+                    [sentence for _, sentence in missing], language)):
+                results[key] = matches
+                self.cache[key] = matches
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        # Re-map sentence-relative offsets into the full text
+        matches = []
+        base = 0
+        previous = 0
+        for start, sentence in sentences:
+            base += utf16_len(text[previous:start])
+            previous = start
+            for match in results[self.cache_key(sentence, language)]:
+                absolute = dict(match)
+                absolute["offset"] = base + match["offset"]
+                matches.append(absolute)
+        return matches
+
+    def check_batch(self, sentences, language):
+        """Check sentences in one request; return a list of matches per sentence"""
+        joined = BATCH_SEPARATOR.join(sentences)
+        starts = []
+        position = 0
+        for sentence in sentences:
+            length = utf16_len(sentence)
+            starts.append((position, position + length))
+            position += length + len(BATCH_SEPARATOR)
+
+        response = self.post({"text": joined, "language": language, **self.params})
+
+        per_sentence = [[] for _ in sentences]
+        index = 0
+        for match in sorted(response.get("matches", []), key=lambda m: m["offset"]):
+            offset = match["offset"]
+            while index < len(starts) and offset >= starts[index][1] + len(BATCH_SEPARATOR):
+                index += 1
+            if index == len(starts):
+                break
+            start, end = starts[index]
+            if offset < start or offset + match["length"] > end:
+                continue  # Spans the separator
+            per_sentence[index].append({
+                "offset": offset - start,
+                "length": match["length"],
+                "message": match["message"],
+                "replacements": [r["value"] for r in match.get("replacements", [])[:5]],
+            })
+        return per_sentence
+
+    def post(self, fields):
+        body = urllib.parse.urlencode(fields).encode('utf-8')
+        headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
+        # Retry once on a fresh connection if the kept-alive one was closed
+        for attempt in range(2):
+            if self.connection is None:
+                connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+                self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.connection.sock is None:
+                    self.connection.connect()
+                    # Small requests on a kept-alive socket otherwise stall on delayed ACKs
+                    self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                self.connection.request("POST", self.path, body, headers)
+                response = self.connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                if attempt:
+                    raise OSError(f"LanguageTool request failed: {e}") from e
+                continue
+            if response.status != 200:
+                raise ValueError(f"LanguageTool returned HTTP {response.status}: {data[:200]!r}")
+            return json.loads(data)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,168 @@
+import os
+import re
+import time
+import queue
+import sqlite3
+import threading
+
+BATCH_SIZE = 200  # Notifications written per transaction at most
+FLUSH_INTERVAL = 1.0  # Seconds a notification may wait before it is written
+PRUNE_EVERY = 1000  # Inserts between retention passes
+PRUNE_INTERVAL = 60 * 60  # Seconds between retention passes at most
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    workspace TEXT,
+    title TEXT,
+    body TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notifications_fts USING fts5(
+    title, body, content='notifications', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS notifications_ai AFTER INSERT ON notifications BEGIN
+    INSERT INTO notifications_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS notifications_ad AFTER DELETE ON notifications BEGIN
+    INSERT INTO notifications_fts(notifications_fts, rowid, title, body)
+    VALUES ('delete', old.id, old.title, old.body);
+END;
+CREATE INDEX IF NOT EXISTS notifications_time ON notifications(time);
+"""
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
+
+class NotificationHistory:
+    """Notification log in SQLite with an FTS5 index over title and body.
+
+    add() only queues the notification; a background thread writes queued
+    notifications in batches so bursts never block the GTK thread.
+    """
+    def __init__(self, path, max_entries=200000, max_age_days=365):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Create the schema up front so search works before the first write
+        connection = self.connect()
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        self.queue = queue.Queue()
+        self.search_connection = None
+        self.writer = threading.Thread(target=self.write_loop, daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        # WAL lets searches read while the writer commits
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def add(self, title, body, workspace=None, timestamp=None):
+        self.queue.put((timestamp or time.time(), workspace, title, body))
+
+    def close(self):
+        """Write out anything still queued and stop the writer"""
+        self.queue.put(None)
+        self.writer.join(timeout=5)
+        if self.search_connection:
+            self.search_connection.close()
+            self.search_connection = None
+
+    def write_loop(self):
+        connection = self.connect()
+        # Retention runs on start and then by count and by time, so it also
+        # happens for sessions that see only a few notifications
+        self.prune_safely(connection)
+        since_prune = 0
+        last_prune = time.monotonic()
+        running = True
+        while running:
+            try:
+                first = self.queue.get(timeout=max(0, last_prune + PRUNE_INTERVAL - time.monotonic()))
+            except queue.Empty:
+                self.prune_safely(connection)
+                since_prune = 0
+                last_prune = time.monotonic()
+                continue
+            batch = [first]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            # None means close() was called; write what we have right away
+            while len(batch) < BATCH_SIZE and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                running = False
+                batch = [entry for entry in batch if entry is not None]
+            if not batch:
+                continue
+
+            try:
+                with connection:
+                    connection.executemany(
+                        "INSERT INTO notifications (time, workspace, title, body) VALUES (?, ?, ?, ?)",
+                        batch
+                    )
+            except sqlite3.Error as e:
+                print(f"Error writing notification history: {e}")
+                continue
+            since_prune += len(batch)
+            if since_prune >= PRUNE_EVERY or time.monotonic() - last_prune >= PRUNE_INTERVAL:
+                self.prune_safely(connection)
+                since_prune = 0
+                last_prune = time.monotonic()
+        connection.close()
+
+    def prune_safely(self, connection):
+        try:
+            self.prune(connection)
+        except sqlite3.Error as e:
+            print(f"Error pruning notification history: {e}")
+
+    def prune(self, connection):
+        with connection:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                connection.execute("DELETE FROM notifications WHERE time < ?", (cutoff,))
+            if self.max_entries:
+                connection.execute(
+                    "DELETE FROM notifications WHERE id <= "
+                    "(SELECT id FROM notifications ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def search(self, text, limit=50):
+        """Newest notifications matching every word of text, as
+        (time, workspace, title, body) tuples"""
+        query = fts_query(text)
+        if not query:
+            return []
+        if self.search_connection is None:
+            self.search_connection = self.connect()
+        try:
+            return self.search_connection.execute(
+                "SELECT n.time, n.workspace, n.title, n.body FROM notifications n "
+                "JOIN (SELECT rowid FROM notifications_fts WHERE notifications_fts MATCH ? "
+                "ORDER BY rowid DESC LIMIT ?) m ON n.id = m.rowid "
+                "ORDER BY n.id DESC",
+                (query, limit)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching notification history: {e}")
+            return []
@@ -0,0 +1,136 @@
+import os
+import time
+import shutil
+import threading
+import subprocess
+import urllib.request
+
+from .config import APP_DIR, CACHE_DIR
+
+LANGUAGETOOL_DIR = os.path.join(APP_DIR, "LanguageTool-6.6")
+SERVER_CLASS = "org.languagetool.server.HTTPServer"
+DEFAULT_PORT = 8081
+DEFAULT_HEAP = "512m"
+DEFAULT_IDLE_TIMEOUT = 10 * 60  # Seconds without checks before the JVM is stopped; 0 keeps it running
+DEFAULT_STARTUP_TIMEOUT = 60
+HEALTH_POLL_INTERVAL = 0.25
+
+class LanguageToolServer:
+    """Starts the bundled LanguageTool server on demand and stops it when idle.
+
+    ensure_running() blocks until the server answers its health endpoint, so
+    call it from a worker thread. A server that is already listening on the
+    port (e.g. one started by the Electron app) is used as is and never
+    stopped by us.
+    """
+    def __init__(self, port=DEFAULT_PORT, heap=DEFAULT_HEAP, cache_size=None, jvm_args=(),
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, startup_timeout=DEFAULT_STARTUP_TIMEOUT,
+                 java="java", directory=LANGUAGETOOL_DIR):
+        self.port = port
+        self.heap = heap
+        self.cache_size = cache_size
+        self.jvm_args = list(jvm_args)
+        self.idle_timeout = idle_timeout
+        self.startup_timeout = startup_timeout
+        self.java = java
+        self.directory = directory
+
+        self.url = f"http://127.0.0.1:{port}"
+        self.process = None
+        self.last_used = 0
+        self.lock = threading.Lock()
+        self.unavailable_reported = False
+
+    def is_healthy(self):
+        try:
+            with urllib.request.urlopen(f"{self.url}/v2/languages", timeout=2) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def ensure_running(self):
+        """Return True once the server is ready to take checks"""
+        with self.lock:
+            self.last_used = time.monotonic()
+            if self.process and self.process.poll() is None:
+                return True
+            if self.is_healthy():
+                return True
+            return self.start()
+
+    def start(self):
+        jar = os.path.join(self.directory, "languagetool-server.jar")
+        java = shutil.which(self.java)
+        if not os.path.exists(jar) or not java:
+            if not self.unavailable_reported:
+                print(f"LanguageTool not available (jar: {jar}, java: {java or 'not found'})")
+                self.unavailable_reported = True
+            return False
+
+        command = [java, f"-Xmx{self.heap}"] + self.jvm_args + [
+            "-cp", jar, SERVER_CLASS,
+            "--port", str(self.port),
+        ]
+        config_file = self.write_config()
+        if config_file:
+            command += ["--config", config_file]
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        log = open(os.path.join(CACHE_DIR, "languagetool.log"), "ab")
+        print("Starting LanguageTool server...")
+        started = time.monotonic()
+        self.process = subprocess.Popen(command, cwd=self.directory, stdout=log, stderr=log)
+        log.close()
+
+        # Poll the health endpoint instead of guessing how long the JVM needs
+        while time.monotonic() - started < self.startup_timeout:
+            if self.process.poll() is not None:
+                print(f"LanguageTool server exited with code {self.process.returncode}")
+                self.process = None
+                return False
+            if self.is_healthy():
+                print(f"LanguageTool ready at {self.url} after {time.monotonic() - started:.1f}s")
+                if self.idle_timeout > 0:
+                    threading.Thread(target=self.watch_idle, args=(self.process,), daemon=True).start()
+                return True
+            time.sleep(HEALTH_POLL_INTERVAL)
+
+        print("LanguageTool server did not become ready in time")
+        self.stop_process()
+        return False
+
+    def write_config(self):
+        """Write the server properties file for the cache options, if any"""
+        if not self.cache_size:
+            return None
+        path = os.path.join(CACHE_DIR, "languagetool-server.properties")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"cacheSize={self.cache_size}\n")
+        return path
+
+    def watch_idle(self, process):
+        while process.poll() is None:
+            time.sleep(min(30, self.idle_timeout))
+            with self.lock:
+                if self.process is not process:
+                    return
+                if time.monotonic() - self.last_used >= self.idle_timeout:
+                    print("Stopping idle LanguageTool server")
+                    self.stop_process()
+                    return
+
+    def stop(self):
+        with self.lock:
+            self.stop_process()
+
+    def stop_process(self):
+        if not self.process:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
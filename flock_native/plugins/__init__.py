@@ -0,0 +1,61 @@
+import importlib
+
+from ..config import plugin_options
+
+# Plugin modules are only imported when enabled, so their GI typelibs and
+# other dependencies are never loaded for profiles that don't use them
+PLUGINS = {
+    "tray": "flock_native.plugins.tray",
+    # history must come before notifications, which stops the signal
+    "history": "flock_native.plugins.history",
+    "notifications": "flock_native.plugins.notifications",
+    "downloads": "flock_native.plugins.downloads",
+    "paste": "flock_native.plugins.paste",
+    "unread": "flock_native.plugins.unread",
+    "spelling": "flock_native.plugins.spelling",
+    "grammar": "flock_native.plugins.grammar",
+}
+
+class Plugin:
+    """Base class for optional features. Override only the hooks you need."""
+    def __init__(self, app, options):
+        self.app = app
+        self.options = options
+
+    def on_plugins_loaded(self):
+        """Called once every enabled plugin has been created"""
+
+    def menu_items(self):
+        """Return (label, callback) pairs for the tray menu"""
+        return []
+
+    def setup_context(self, context):
+        """Called once for every new WebKit2.WebContext"""
+
+    def setup_webview(self, webview, workspace):
+        """Called for every new WebView, including pop-outs"""
+
+    def on_load_finished(self, webview, workspace):
+        """Called when a page has finished loading"""
+
+    def on_unread_changed(self):
+        """Called on the GTK thread when a workspace's unread state changes"""
+
+    def shutdown(self):
+        """Called before the application quits"""
+
+def load_plugins(app, config):
+    plugins = []
+    for name, module_name in PLUGINS.items():
+        options = plugin_options(config, name)
+        if options is None:
+            continue
+        try:
+            module = importlib.import_module(module_name)
+        except (ImportError, ValueError) as e:
+            # ValueError is raised by gi.require_version for missing typelibs
+            print(f"Warning: Could not load plugin {name}: {e}")
+            continue
+        plugins.append(module.PLUGIN(app, options))
+        print(f"Loaded plugin: {name}")
+    return plugins
@@ -0,0 +1,132 @@
+import os
+import subprocess
+from urllib.parse import urlparse, unquote
+
+import gi
+gi.require_version('WebKit2', '4.0')
+gi.require_version('Notify', '0.7')
+from gi.repository import WebKit2, Notify
+
+from . import Plugin
+from ..config import ICON_PATH
+
+DOWNLOAD_URI_PATTERNS = ['/download/', 'download=', 'export=', '.pdf', '.zip', '.doc', '.xls']
+DOWNLOADABLE_MIMES = [
+    'application/pdf', 'application/zip', 'application/octet-stream',
+    'application/msword', 'application/vnd.ms-excel', 'image/', 'video/', 'audio/'
+]
+
+class DownloadsPlugin(Plugin):
+    """Saves downloads to ~/Downloads and reports them through libnotify"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        self.directory = os.path.expanduser(options.get("directory", "~/Downloads"))
+        self.open_folder = options.get("open_folder", True)
+        if not Notify.is_initted():
+            Notify.init("Flock Native")
+
+    def setup_context(self, context):
+        # Handle download requests
+        context.connect("download-started", self.on_download_started)
+
+    def setup_webview(self, webview, workspace):
+        webview.connect("decide-policy", self.on_navigation_decision)
+
+    def on_navigation_decision(self, webview, decision, decision_type):
+        if decision_type == WebKit2.PolicyDecisionType.NAVIGATION_ACTION:
+            uri = decision.get_navigation_action().get_request().get_uri()
+
+            # Check for download links by looking at the URI
+            if uri and any(pattern in uri.lower() for pattern in DOWNLOAD_URI_PATTERNS):
+                print(f"Detected download link: {uri}")
+                decision.download()
+                return True
+
+        elif decision_type == WebKit2.PolicyDecisionType.RESPONSE:
+            # Handle downloads based on response
+            response = decision.get_response()
+            mime_type = response.get_mime_type()
+            uri = response.get_uri()
+
+            # Check Content-Disposition header
+            headers = response.get_http_headers()
+            if headers:
+                disposition = headers.get_one("Content-Disposition")
+                if disposition and "attachment" in disposition:
+                    print(f"Attachment detected: {uri}")
+                    decision.download()
+                    return True
+
+            # Check if this is a downloadable file by MIME type
+            if mime_type and any(mime in mime_type for mime in DOWNLOADABLE_MIMES):
+                print(f"Downloadable MIME type: {mime_type}")
+                decision.download()
+                return True
+
+        return False
+
+    def on_download_started(self, context, download):
+        # Get the download details
+        uri = download.get_request().get_uri()
+
+        # Get suggested filename - method name is different in WebKit2
+        response = download.get_response()
+        suggested_filename = response.get_suggested_filename() if response else None
+
+        # If no suggested filename, extract from URI
+        if not suggested_filename:
+            path = urlparse(uri).path
+            suggested_filename = unquote(os.path.basename(path)) or "download"
+
+        print(f"Download started for URI: {uri}")
+
+        # Set download destination
+        downloads_dir = self.directory
+        if not os.path.exists(downloads_dir):
+            downloads_dir = os.path.expanduser("~")
+
+        destination = os.path.join(downloads_dir, suggested_filename)
+
+        # Handle file conflicts
+        base, ext = os.path.splitext(destination)
+        counter = 1
+        while os.path.exists(destination):
+            destination = f"{base} ({counter}){ext}"
+            counter += 1
+
+        print(f"Saving to: {destination}")
+        download.set_destination(f"file://{destination}")
+
+        # Connect to download progress signals
+        download.connect("finished", self.on_download_finished, destination)
+        download.connect("failed", self.on_download_failed)
+
+        return False  # Let WebKit handle the download
+
+    def on_download_finished(self, download, destination):
+        print(f"Download completed: {destination}")
+        # Show notification
+        notify = Notify.Notification.new(
+            "Download Complete",
+            f"File saved to: {os.path.basename(destination)}",
+            ICON_PATH
+        )
+        notify.show()
+
+        # Open the downloads folder
+        if self.open_folder:
+            try:
+                subprocess.run(['xdg-open', os.path.dirname(destination)], check=False)
+            except OSError:
+                pass
+
+    def on_download_failed(self, download, error):
+        print(f"Download failed: {error}")
+        notify = Notify.Notification.new(
+            "Download Failed",
+            "The download could not be completed",
+            ICON_PATH
+        )
+        notify.show()
+
+PLUGIN = DownloadsPlugin
@@ -0,0 +1,308 @@
+import json
+import queue
+import threading
+
+from gi.repository import GLib
+
+from . import Plugin
+from ..config import plugin_options
+from ..grammar_client import GrammarClient, DEFAULT_CACHE_SIZE
+from ..languagetool import LanguageToolServer, DEFAULT_PORT, DEFAULT_HEAP, DEFAULT_IDLE_TIMEOUT
+
+MESSAGE_HANDLER = "flockGrammar"
+DEFAULT_DELAY = 1500  # Milliseconds after the last keystroke
+SPELLING_DELAY = 3000  # Typos are already underlined, so grammar can wait longer
+
+# Sends the focused editor's text to Python once typing has paused and the
+# page is idle, and shows LanguageTool matches in a small panel with
+# clickable suggestions
+GRAMMAR_SCRIPT = """
+(function(viewId, delay) {
+    if (window.flockGrammar) {
+        return;
+    }
+
+    let requestId = 0;
+    let started = false;
+    let checkTimeout = null;
+    let idleCallback = null;
+    let lastCheckedText = '';
+    let currentElement = null;
+    let currentText = '';
+
+    const style = document.createElement('style');
+    style.textContent = `
+        #flock-grammar-panel {
+            position: fixed; right: 20px; bottom: 80px; z-index: 10000;
+            max-width: 360px; background: white; color: #333;
+            border: 1px solid #ccc; border-radius: 4px; padding: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.2); font: 13px sans-serif;
+        }
+        #flock-grammar-panel .grammar-message { font-weight: bold; margin-top: 4px; }
+        #flock-grammar-panel .grammar-suggestion {
+            display: inline-block; margin: 2px 4px 2px 0; padding: 1px 6px;
+            border-radius: 3px; background: #e8f5e9; cursor: pointer;
+        }
+        #flock-grammar-panel .grammar-close { float: right; cursor: pointer; color: #999; }
+    `;
+    document.head.appendChild(style);
+
+    function editableText(element) {
+        return element.tagName === 'TEXTAREA' ? element.value : element.innerText;
+    }
+
+    function removePanel() {
+        const panel = document.getElementById('flock-grammar-panel');
+        if (panel) {
+            panel.remove();
+        }
+    }
+
+    // Select the error inside the editor so insertText goes through the
+    // editor's own input handling
+    function selectError(element, match) {
+        if (element.tagName === 'TEXTAREA') {
+            element.focus();
+            element.setSelectionRange(match.offset, match.offset + match.length);
+            return true;
+        }
+
+        const errorText = currentText.substr(match.offset, match.length);
+        let occurrence = currentText.substring(0, match.offset).split(errorText).length - 1;
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        let node;
+        while ((node = walker.nextNode())) {
+            let index = node.data.indexOf(errorText);
+            while (index !== -1) {
+                if (occurrence === 0) {
+                    const range = document.createRange();
+                    range.setStart(node, index);
+                    range.setEnd(node, index + errorText.length);
+                    const selection = window.getSelection();
+                    selection.removeAllRanges();
+                    selection.addRange(range);
+                    return true;
+                }
+                occurrence--;
+                index = node.data.indexOf(errorText, index + 1);
+            }
+        }
+        return false;
+    }
+
+    function applySuggestion(match, value) {
+        const element = currentElement;
+        if (!element || editableText(element) !== currentText) {
+            removePanel();
+            return;
+        }
+        if (selectError(element, match)) {
+            document.execCommand('insertText', false, value);
+        }
+        removePanel();
+    }
+
+    function showPanel(matches) {
+        removePanel();
+        if (!matches.length) {
+            return;
+        }
+
+        const panel = document.createElement('div');
+        panel.id = 'flock-grammar-panel';
+
+        const close = document.createElement('span');
+        close.className = 'grammar-close';
+        close.textContent = '✕';
+        close.onclick = removePanel;
+        panel.appendChild(close);
+
+        matches.slice(0, 5).forEach(match => {
+            const message = document.createElement('div');
+            message.className = 'grammar-message';
+            message.textContent = '"' + currentText.substr(match.offset, match.length) + '": ' + match.message;
+            panel.appendChild(message);
+
+            match.replacements.forEach(value => {
+                const item = document.createElement('span');
+                item.className = 'grammar-suggestion';
+                item.textContent = value;
+                // Keep focus in the editor
+                item.onmousedown = e => e.preventDefault();
+                item.onclick = () => applySuggestion(match, value);
+                panel.appendChild(item);
+            });
+        });
+
+        document.body.appendChild(panel);
+    }
+
+    document.addEventListener('input', function(e) {
+        const target = e.target;
+        if (!target || !(target.isContentEditable || target.tagName === 'TEXTAREA')) {
+            return;
+        }
+        if (!started) {
+            // Let the server warm up while the user is still typing
+            started = true;
+            window.webkit.messageHandlers.flockGrammar.postMessage(
+                JSON.stringify({view: viewId, type: 'start'}));
+        }
+        clearTimeout(checkTimeout);
+        if (idleCallback && window.cancelIdleCallback) {
+            cancelIdleCallback(idleCallback);
+        }
+        checkTimeout = setTimeout(function() {
+            // Wait for the page to be idle as well so checks never compete with typing
+            if (window.requestIdleCallback) {
+                idleCallback = requestIdleCallback(check, {timeout: 2000});
+            } else {
+                check();
+            }
+        }, delay);
+
+        function check() {
+            idleCallback = null;
+            const text = editableText(target);
+            if (text.length > 10 && text !== lastCheckedText) {
+                lastCheckedText = text;
+                currentElement = target;
+                currentText = text;
+                requestId++;
+                window.webkit.messageHandlers.flockGrammar.postMessage(
+                    JSON.stringify({view: viewId, type: 'check', id: requestId, text: text}));
+            } else if (text.length <= 10) {
+                removePanel();
+            }
+        }
+    }, true);
+
+    window.flockGrammar = {
+        show: function(id, matches) {
+            // Ignore results for text that has changed since
+            if (id === requestId) {
+                showPanel(matches);
+            }
+        }
+    };
+
+    console.log('Grammar checker installed');
+})(%d, %d);
+"""
+
+class GrammarPlugin(Plugin):
+    """Checks messages against a LanguageTool server while typing"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        if options.get("server_url"):
+            # Someone else runs the server
+            self.server = None
+            self.server_url = options["server_url"].rstrip('/')
+        else:
+            # Started on first input and stopped again when idle
+            self.server = LanguageToolServer(
+                port=options.get("port", DEFAULT_PORT),
+                heap=options.get("heap", DEFAULT_HEAP),
+                cache_size=options.get("cache_size"),
+                jvm_args=options.get("jvm_args", []),
+                idle_timeout=options.get("idle_timeout", DEFAULT_IDLE_TIMEOUT),
+                java=options.get("java", "java")
+            )
+            self.server_url = self.server.url
+        self.language = options.get("language", "en-US")
+
+        # With the spelling plugin on, WebKit underlines typos instantly and
+        # LanguageTool only has to look for grammar and style problems
+        native_spelling = plugin_options(app.config, "spelling") is not None
+        self.check_spelling = options.get("check_spelling", not native_spelling)
+        params = {} if self.check_spelling else {"disabledCategories": "TYPOS"}
+        self.delay = options.get("delay", DEFAULT_DELAY if self.check_spelling else SPELLING_DELAY)
+        self.client = GrammarClient(self.server_url, cache_size=options.get("sentence_cache", DEFAULT_CACHE_SIZE),
+                                    params=params)
+
+        self.views = {}
+        self.next_view_id = 1
+        self.managers = set()
+        self.server_error_reported = False
+
+        # Checks run on a worker thread so the GTK thread never waits on HTTP
+        self.requests = queue.Queue()
+        worker = threading.Thread(target=self.process_requests, daemon=True)
+        worker.start()
+
+    def setup_webview(self, webview, workspace):
+        view_id = self.next_view_id
+        self.next_view_id += 1
+        self.views[view_id] = webview
+        webview.connect("destroy", self.on_webview_destroy, view_id)
+
+        # Related views share a content manager; register the handler once
+        manager = webview.get_user_content_manager()
+        if manager not in self.managers:
+            self.managers.add(manager)
+            manager.register_script_message_handler(MESSAGE_HANDLER)
+            manager.connect(f"script-message-received::{MESSAGE_HANDLER}", self.on_script_message)
+
+    def on_webview_destroy(self, webview, view_id):
+        self.views.pop(view_id, None)
+
+    def on_load_finished(self, webview, workspace):
+        for view_id, view in self.views.items():
+            if view is webview:
+                script = GRAMMAR_SCRIPT % (view_id, self.delay)
+                webview.evaluate_javascript(script, -1, None, None, None, None)
+                break
+
+    def on_script_message(self, manager, js_result):
+        try:
+            message = json.loads(js_result.get_js_value().to_string())
+        except (ValueError, TypeError) as e:
+            print(f"Invalid grammar message: {e}")
+            return
+        if message.get("type") == "start":
+            self.requests.put(None)
+        else:
+            self.requests.put((message["view"], message["id"], message["text"]))
+
+    def shutdown(self):
+        if self.server:
+            self.server.stop()
+
+    def process_requests(self):
+        while True:
+            request = self.requests.get()
+            if self.server and not self.server.ensure_running():
+                continue
+            if request is None:
+                continue  # Only a start request
+            view_id, request_id, text = request
+            matches = self.check(text)
+            if matches is not None:
+                GLib.idle_add(self.send_results, view_id, request_id, matches)
+
+    def check(self, text):
+        try:
+            matches = self.client.check(text, self.language)
+        except (OSError, ValueError) as e:
+            if not self.server_error_reported:
+                print(f"LanguageTool server not reachable at {self.server_url}: {e}")
+                self.server_error_reported = True
+            return None
+        except (KeyError, AttributeError, TypeError) as e:
+            # A malformed response must not kill the worker thread
+            if not self.server_error_reported:
+                print(f"Unexpected response from LanguageTool at {self.server_url}: {e!r}")
+                self.server_error_reported = True
+            return None
+
+        self.server_error_reported = False
+        return matches
+
+    def send_results(self, view_id, request_id, matches):
+        webview = self.views.get(view_id)
+        if webview is not None:
+            script = f"window.flockGrammar && window.flockGrammar.show({request_id}, {json.dumps(matches)});"
+            webview.evaluate_javascript(script, -1, None, None, None, None)
+        return False
+
+PLUGIN = GrammarPlugin
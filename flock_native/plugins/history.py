@@ -0,0 +1,105 @@
+import os
+import time
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Gdk', '3.0')
+from gi.repository import Gtk, Gdk, GLib, Pango
+
+from . import Plugin
+from ..config import DATA_DIR
+from ..history import NotificationHistory
+
+HISTORY_FILE = os.path.join(DATA_DIR, "notifications.db")
+
+class HistoryPlugin(Plugin):
+    """Keeps every notification in a searchable local history"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        self.history = NotificationHistory(
+            os.path.expanduser(options.get("path", HISTORY_FILE)),
+            max_entries=options.get("max_entries", 200000),
+            max_age_days=options.get("max_age_days", 365)
+        )
+        self.search_window = None
+
+        # Ctrl+Shift+F opens the search window, tray or not
+        accel_group = Gtk.AccelGroup()
+        accel_group.connect(Gdk.KEY_f, Gdk.ModifierType.CONTROL_MASK | Gdk.ModifierType.SHIFT_MASK,
+                            Gtk.AccelFlags.VISIBLE, self.on_search_accel)
+        app.window.add_accel_group(accel_group)
+
+    def menu_items(self):
+        return [("Search Notifications…", self.show_search_window)]
+
+    def setup_webview(self, webview, workspace):
+        webview.connect("show-notification", self.on_show_notification, workspace)
+
+    def on_show_notification(self, webview, notification, workspace):
+        # Only queues the entry; the history writes in the background
+        self.history.add(notification.get_title(), notification.get_body(), workspace.name)
+        return False  # Let the notifications plugin or WebKit show it
+
+    def shutdown(self):
+        self.history.close()
+
+    def on_search_accel(self, accel_group, acceleratable, keyval, modifier):
+        self.show_search_window()
+        return True
+
+    def show_search_window(self):
+        if self.search_window is None:
+            self.create_search_window()
+        self.search_window.show_all()
+        self.search_window.present()
+        self.search_entry.grab_focus()
+
+    def create_search_window(self):
+        self.search_window = Gtk.Window(title="Notification History")
+        self.search_window.set_default_size(500, 600)
+        self.search_window.set_transient_for(self.app.window)
+        self.search_window.connect("delete-event", self.on_search_window_delete)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        box.set_border_width(6)
+
+        self.search_entry = Gtk.SearchEntry()
+        self.search_entry.set_placeholder_text("Search sender or message")
+        self.search_entry.connect("search-changed", self.on_search_changed)
+        box.pack_start(self.search_entry, False, False, 0)
+
+        self.results = Gtk.ListBox()
+        self.results.set_selection_mode(Gtk.SelectionMode.NONE)
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.add(self.results)
+        box.pack_start(scrolled, True, True, 0)
+
+        self.search_window.add(box)
+
+    def on_search_window_delete(self, window, event):
+        window.hide()
+        return True
+
+    def on_search_changed(self, entry):
+        for row in self.results.get_children():
+            self.results.remove(row)
+
+        show_workspace = len(self.app.workspaces) > 1
+        for timestamp, workspace, title, body in self.history.search(entry.get_text()):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+            heading = f"{title} · {workspace} · {when}" if show_workspace else f"{title} · {when}"
+
+            title_label = Gtk.Label(xalign=0)
+            title_label.set_markup(f"<b>{GLib.markup_escape_text(heading)}</b>")
+            body_label = Gtk.Label(label=body or "", xalign=0)
+            body_label.set_line_wrap(True)
+            body_label.set_line_wrap_mode(Pango.WrapMode.WORD_CHAR)
+
+            row_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=2)
+            row_box.set_border_width(4)
+            row_box.pack_start(title_label, False, False, 0)
+            row_box.pack_start(body_label, False, False, 0)
+            self.results.add(row_box)
+        self.results.show_all()
+
+PLUGIN = HistoryPlugin
@@ -0,0 +1,258 @@
+import os
+import tempfile
+import subprocess
+
+import gi
+gi.require_version('Notify', '0.7')
+gi.require_version('Gtk', '3.0')
+from gi.repository import Gio, GLib, Gtk, Notify
+
+try:
+    import cairo
+except ImportError:
+    print("Warning: Could not import cairo for avatar generation")
+    cairo = None
+
+from . import Plugin
+from ..config import APP_DIR, CONFIG_DIR, ICON_PATH
+from ..rules import RuleSet
+
+SOUND_FILE = os.path.join(APP_DIR, "notification-sound", "onmessage.wav")
+RULES_FILE = os.path.join(CONFIG_DIR, "rules.json")
+DEFAULT_DIGEST_INTERVAL = 15 * 60  # Seconds between digest notifications
+
+# Initialize audio context to ensure notification sounds work
+AUDIO_INIT_SCRIPT = """
+(function() {
+    // Create and resume audio context to enable sounds
+    if (window.AudioContext || window.webkitAudioContext) {
+        const AudioContext = window.AudioContext || window.webkitAudioContext;
+        const audioContext = new AudioContext();
+
+        // Resume audio context (required by some browsers)
+        if (audioContext.state === 'suspended') {
+            audioContext.resume().then(() => {
+                console.log('Audio context resumed');
+            });
+        }
+
+        // Try to find and initialize Flock's notification sound
+        setTimeout(() => {
+            // Look for audio elements or Flock's sound initialization
+            const audioElements = document.querySelectorAll('audio');
+            audioElements.forEach(audio => {
+                audio.load();
+                console.log('Preloaded audio element:', audio.src);
+            });
+        }, 2000);
+    }
+
+    console.log('Audio initialization complete');
+})();
+"""
+
+def init_notify():
+    if not Notify.is_initted():
+        Notify.init("Flock Native")
+
+class NotificationsPlugin(Plugin):
+    """Shows web notifications through libnotify with letter avatars and a sound"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        self.sound_file = options.get("sound", SOUND_FILE)
+        self.digest_interval = options.get("digest_interval", DEFAULT_DIGEST_INTERVAL)
+        self.digest = []
+        self.digest_source = None
+        init_notify()
+
+        # Rules are compiled once and recompiled whenever the file changes
+        self.rules_path = os.path.expanduser(options.get("rules", RULES_FILE))
+        self.rules = RuleSet.load(self.rules_path)
+        self.rules_monitor = Gio.File.new_for_path(self.rules_path).monitor_file(
+            Gio.FileMonitorFlags.NONE, None)
+        self.rules_monitor.connect("changed", self.on_rules_changed)
+
+    def on_rules_changed(self, monitor, file, other_file, event_type):
+        if event_type in (Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+                          Gio.FileMonitorEvent.CREATED,
+                          Gio.FileMonitorEvent.DELETED):
+            self.rules = RuleSet.load(self.rules_path)
+            print(f"Reloaded {len(self.rules.rules)} notification rules")
+
+    def menu_items(self):
+        return [("Notification Rule Hits", self.show_rule_hits)]
+
+    def show_rule_hits(self):
+        counts = self.rules.hit_counts()
+        if counts:
+            text = "\n".join(f"{name} ({action}): {hits}" for name, action, hits in counts)
+        else:
+            text = f"No rules in {self.rules_path}"
+        dialog = Gtk.MessageDialog(
+            transient_for=self.app.window,
+            message_type=Gtk.MessageType.INFO,
+            buttons=Gtk.ButtonsType.CLOSE,
+            text="Notification rule hits since last reload"
+        )
+        dialog.format_secondary_text(text)
+        dialog.run()
+        dialog.destroy()
+
+    def setup_webview(self, webview, workspace):
+        webview.connect("show-notification", self.on_show_notification)
+
+    def on_load_finished(self, webview, workspace):
+        webview.evaluate_javascript(AUDIO_INIT_SCRIPT, -1, None, None, None, None)
+
+    def shutdown(self):
+        if self.digest:
+            self.flush_digest()
+        if Notify.is_initted():
+            Notify.uninit()
+
+    def generate_letter_avatar(self, name, size=48):
+        """Generate a letter avatar image for the given name"""
+        if not cairo:
+            return None
+
+        # Get first letter and color
+        letter = name[0].upper() if name else "?"
+
+        # Generate a color based on the name (consistent color for same name)
+        colors = [
+            (0.91, 0.30, 0.24),  # Red
+            (0.90, 0.49, 0.13),  # Orange
+            (0.95, 0.77, 0.06),  # Yellow
+            (0.54, 0.76, 0.29),  # Green
+            (0.12, 0.53, 0.90),  # Blue
+            (0.41, 0.30, 0.65),  # Purple
+            (0.90, 0.30, 0.55),  # Pink
+        ]
+        color_index = ord(letter) % len(colors)
+        bg_color = colors[color_index]
+
+        # Create temporary file
+        temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+        temp_path = temp_file.name
+        temp_file.close()
+
+        try:
+            # Create cairo surface and context
+            surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+            ctx = cairo.Context(surface)
+
+            # Draw circular background
+            ctx.arc(size/2, size/2, size/2, 0, 2 * 3.14159)
+            ctx.set_source_rgb(*bg_color)
+            ctx.fill()
+
+            # Draw letter
+            ctx.set_source_rgb(1, 1, 1)  # White text
+            ctx.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_BOLD)
+            ctx.set_font_size(size * 0.5)
+
+            # Center the text
+            text_extents = ctx.text_extents(letter)
+            x = (size - text_extents.width) / 2 - text_extents.x_bearing
+            y = (size - text_extents.height) / 2 - text_extents.y_bearing
+
+            ctx.move_to(x, y)
+            ctx.show_text(letter)
+
+            # Save to file
+            surface.write_to_png(temp_path)
+
+            return temp_path
+        except Exception as e:
+            print(f"Error generating avatar: {e}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return None
+
+    def on_show_notification(self, webview, notification):
+        # Handle WebKit notification and show it via libnotify
+        title = notification.get_title()
+        body = notification.get_body()
+
+        # Rules run first so filtered notifications skip the avatar and sound
+        action, _ = self.rules.evaluate(title, body)
+        if action == "drop":
+            notification.close()
+            return True
+        if action == "digest":
+            self.add_to_digest(title, body)
+            notification.close()
+            return True
+        if action == "silent":
+            notify = Notify.Notification.new(title, body, ICON_PATH)
+            notify.set_urgency(Notify.Urgency.LOW)
+            notify.show()
+            notification.close()
+            return True
+
+        # Generate a letter avatar based on the sender's name
+        avatar_path = self.generate_letter_avatar(title)
+
+        # Use generated avatar or fall back to default icon
+        if avatar_path:
+            icon_path = avatar_path
+            # Clean up temp file after notification
+            GLib.timeout_add_seconds(10, lambda: os.unlink(avatar_path) if os.path.exists(avatar_path) else None)
+        else:
+            icon_path = ICON_PATH
+
+        # Show the notification
+        notify = Notify.Notification.new(title, body, icon_path)
+        if action == "urgent":
+            notify.set_urgency(Notify.Urgency.CRITICAL)
+        else:
+            notify.set_urgency(Notify.Urgency.NORMAL)
+        notify.set_timeout(Notify.EXPIRES_NEVER)  # Stay until dismissed without being red
+        notify.show()
+
+        self.play_sound()
+
+        # Close the WebKit notification (we're handling it ourselves)
+        notification.close()
+        return True
+
+    def add_to_digest(self, title, body):
+        self.digest.append((title, body))
+        if self.digest_source is None:
+            self.digest_source = GLib.timeout_add_seconds(self.digest_interval, self.flush_digest)
+
+    def flush_digest(self):
+        self.digest_source = None
+        if not self.digest:
+            return False
+
+        senders = []
+        for title, body in self.digest:
+            if title not in senders:
+                senders.append(title)
+        summary = f"{len(self.digest)} notifications held for digest"
+        details = ", ".join(senders[:5])
+        if len(senders) > 5:
+            details += f" and {len(senders) - 5} more"
+        self.digest = []
+
+        notify = Notify.Notification.new(summary, details, ICON_PATH)
+        notify.set_urgency(Notify.Urgency.LOW)
+        notify.show()
+        return False
+
+    def play_sound(self):
+        # Play Flock notification sound
+        if not os.path.exists(self.sound_file):
+            return
+        try:
+            # Use paplay (PulseAudio) to play the sound
+            subprocess.Popen(['paplay', self.sound_file], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except:
+            try:
+                # Fallback to aplay if paplay is not available
+                subprocess.Popen(['aplay', '-q', self.sound_file], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except:
+                pass
+
+PLUGIN = NotificationsPlugin
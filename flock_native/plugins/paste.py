@@ -0,0 +1,206 @@
+import base64
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Gdk', '3.0')
+from gi.repository import Gtk, Gdk
+
+from . import Plugin
+
+CLIPBOARD_SCRIPT = """
+(function() {
+    // Override paste event handling to ensure images work
+    document.addEventListener('paste', function(e) {
+        console.log('Paste event detected');
+
+        // Check if we have clipboard data
+        if (!e.clipboardData || !e.clipboardData.items) {
+            console.log('No clipboard data available');
+            return;
+        }
+
+        for (let i = 0; i < e.clipboardData.items.length; i++) {
+            const item = e.clipboardData.items[i];
+
+            // Handle image paste
+            if (item.type.indexOf('image') !== -1) {
+                // Get the active element
+                const activeElement = document.activeElement;
+
+                // Check if we're in a contenteditable or input area
+                if (activeElement && (activeElement.contentEditable === 'true' ||
+                    activeElement.tagName === 'TEXTAREA' ||
+                    activeElement.tagName === 'INPUT')) {
+
+                    console.log('Pasting image into editable area');
+
+                    // Let the default handler process it
+                    // But ensure the browser doesn't prevent it
+                    e.stopImmediatePropagation();
+                }
+            }
+        }
+    }, true); // Use capture phase to handle before any other listeners
+
+    console.log('Clipboard handler installed');
+})();
+"""
+
+class PastePlugin(Plugin):
+    """Pastes clipboard images into Flock as file uploads"""
+    def setup_webview(self, webview, workspace):
+        # Connect to key press events to handle paste
+        webview.connect("key-press-event", self.on_key_press)
+
+    def on_load_finished(self, webview, workspace):
+        # Inject clipboard handling enhancement
+        webview.evaluate_javascript(CLIPBOARD_SCRIPT, -1, None, None, None, None)
+
+    def on_key_press(self, widget, event):
+        """Handle key press events to intercept paste operations"""
+        # Check if Ctrl+V is pressed
+        if event.state & Gdk.ModifierType.CONTROL_MASK and event.keyval == Gdk.KEY_v:
+            # Get clipboard
+            clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
+
+            # Check if clipboard has an image
+            if clipboard.wait_is_image_available():
+                print("Image detected in clipboard, handling paste")
+                print(f"Clipboard image available: True")
+
+                # Get the image from clipboard
+                pixbuf = clipboard.wait_for_image()
+                print(f"Got pixbuf: {pixbuf is not None}")
+                if pixbuf:
+                    # Save pixbuf to bytes
+                    success, buffer = pixbuf.save_to_bufferv("png", [], [])
+                    if success:
+                        image_data = buffer
+                    else:
+                        print("Failed to convert image to buffer")
+                        return False
+
+                    # Convert to base64
+                    base64_data = base64.b64encode(image_data).decode('utf-8')
+                    data_url = f"data:image/png;base64,{base64_data}"
+
+                    # Convert base64 to blob and trigger file upload
+                    script = f"""
+                    (function() {{
+                        console.log('[Image Paste] Starting image paste handler');
+
+                        // Show alert to confirm script is running
+                        // alert('Image paste handler triggered!');
+
+                        try {{
+
+                        // Convert base64 to blob
+                        function base64ToBlob(base64Data, contentType) {{
+                            const byteCharacters = atob(base64Data);
+                            const byteArrays = [];
+
+                            for (let offset = 0; offset < byteCharacters.length; offset += 512) {{
+                                const slice = byteCharacters.slice(offset, offset + 512);
+                                const byteNumbers = new Array(slice.length);
+
+                                for (let i = 0; i < slice.length; i++) {{
+                                    byteNumbers[i] = slice.charCodeAt(i);
+                                }}
+
+                                const byteArray = new Uint8Array(byteNumbers);
+                                byteArrays.push(byteArray);
+                            }}
+
+                            return new Blob(byteArrays, {{type: contentType}});
+                        }}
+
+                        // Create a File object from the blob
+                        const base64Data = '{base64_data}';
+                        const blob = base64ToBlob(base64Data, 'image/png');
+                        const file = new File([blob], 'pasted-image.png', {{ type: 'image/png' }});
+
+                        // Create a synthetic paste event with the file
+                        const dataTransfer = new DataTransfer();
+                        dataTransfer.items.add(file);
+
+                        // Try to find file input or trigger paste with file
+                        const activeElement = document.activeElement;
+
+                        console.log('[Image Paste] Active element:', activeElement);
+                        console.log('[Image Paste] Active element tag:', activeElement?.tagName);
+                        console.log('[Image Paste] Active element contentEditable:', activeElement?.contentEditable);
+
+                        // Look for a file input field that might be hidden
+                        const fileInputs = document.querySelectorAll('input[type="file"]');
+                        console.log('[Image Paste] Found file inputs:', fileInputs.length);
+
+                        let fileInput = null;
+
+                        // Find the most relevant file input (visible or recently used)
+                        for (let input of fileInputs) {{
+                            const rect = input.getBoundingClientRect();
+                            const style = window.getComputedStyle(input);
+                            console.log('[Image Paste] Checking file input:', input, 'display:', style.display);
+
+                            // Check if input is somewhat visible or positioned near active element
+                            if (style.display !== 'none' || 
+                                (activeElement && input.closest('.chat-input, .message-input, [contenteditable]'))) {{
+                                fileInput = input;
+                                break;
+                            }}
+                        }}
+
+                        if (fileInput) {{
+                            console.log('[Image Paste] Using file input:', fileInput);
+                            // Programmatically set the file
+                            const dt = new DataTransfer();
+                            dt.items.add(file);
+                            fileInput.files = dt.files;
+
+                            // Trigger change event
+                            fileInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
+                            console.log('[Image Paste] Triggered change event on file input');
+                        }} else {{
+                            console.log('[Image Paste] No suitable file input found, using paste event fallback');
+                            // Fallback: Create a paste event with file data
+                            const pasteEvent = new ClipboardEvent('paste', {{
+                                clipboardData: dataTransfer,
+                                bubbles: true,
+                                cancelable: true
+                            }});
+
+                            if (activeElement) {{
+                                activeElement.dispatchEvent(pasteEvent);
+                                console.log('[Image Paste] Dispatched paste event to active element');
+                            }} else {{
+                                document.dispatchEvent(pasteEvent);
+                                console.log('[Image Paste] Dispatched paste event to document');
+                            }}
+                        }}
+
+                        return 'Image paste handler completed';
+
+                        }} catch (error) {{
+                            console.error('[Image Paste] Error:', error);
+                            return 'Error: ' + error.toString();
+                        }}
+                    }})();
+                    """
+
+                    # Add callback to see JavaScript execution results
+                    def script_finished(webview, result, user_data):
+                        try:
+                            value = webview.evaluate_javascript_finish(result)
+                            print(f"Script execution result: {value}")
+                        except Exception as e:
+                            print(f"Script execution error: {e}")
+
+                    widget.evaluate_javascript(script, -1, None, None, None, script_finished, None)
+
+                    # Prevent default paste behavior
+                    return True
+
+        # Let other key events pass through
+        return False
+
+PLUGIN = PastePlugin
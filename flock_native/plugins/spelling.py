@@ -0,0 +1,31 @@
+from . import Plugin
+from ..spelling import prepare_enchant
+
+DEFAULT_LANGUAGES = ["en_US"]
+
+class SpellingPlugin(Plugin):
+    """Underlines misspelled words as you type using WebKit's built-in checker.
+
+    WebKit checks spelling in-process through enchant and Hunspell, so there
+    is no round trip and no server. The Hunspell dictionaries bundled with
+    LanguageTool are added to the system ones.
+    """
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        self.languages = options.get("languages", DEFAULT_LANGUAGES)
+
+        try:
+            available = prepare_enchant()
+        except OSError as e:
+            print(f"Warning: Could not set up bundled dictionaries: {e}")
+            available = None
+        if available is not None:
+            for language in self.languages:
+                if language not in available:
+                    print(f"Warning: No Hunspell dictionary found for {language}")
+
+    def setup_context(self, context):
+        context.set_spell_checking_enabled(True)
+        context.set_spell_checking_languages(self.languages)
+
+PLUGIN = SpellingPlugin
@@ -0,0 +1,109 @@
+import os
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('AppIndicator3', '0.1')
+from gi.repository import Gtk, AppIndicator3
+
+from . import Plugin
+from ..config import APP_DIR
+
+TRAY_ICON = os.path.join(APP_DIR, "tray-icon-mono.png")
+TRAY_ICON_UNREAD = os.path.join(APP_DIR, "tray-icon-green.png")
+
+class TrayPlugin(Plugin):
+    """Tray icon with unread indicator; closing the window hides it to the tray"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+
+        # Track window visibility
+        self.is_visible = True
+
+        self.indicator = AppIndicator3.Indicator.new(
+            "flock-native",
+            TRAY_ICON,
+            AppIndicator3.IndicatorCategory.APPLICATION_STATUS
+        )
+        self.indicator.set_status(AppIndicator3.IndicatorStatus.ACTIVE)
+
+        # Handle window delete event (close button)
+        app.window.connect("delete-event", self.on_window_delete)
+
+    def on_plugins_loaded(self):
+        # Create tray menu once other plugins can contribute items
+        self.create_menu()
+
+    def create_menu(self):
+        menu = Gtk.Menu()
+
+        # Show/Hide item
+        self.show_hide_item = Gtk.MenuItem(label="Hide")
+        self.show_hide_item.connect("activate", self.toggle_window)
+        menu.append(self.show_hide_item)
+
+        # Workspace items
+        self.workspace_items = {}
+        if len(self.app.workspaces) > 1:
+            menu.append(Gtk.SeparatorMenuItem())
+            for workspace in self.app.workspaces:
+                item = Gtk.MenuItem(label=workspace.name)
+                item.connect("activate", self.on_workspace_item_activate, workspace)
+                menu.append(item)
+                self.workspace_items[workspace.slug] = item
+
+        # Items from other plugins
+        plugin_items = [item for plugin in self.app.plugins for item in plugin.menu_items()]
+        if plugin_items:
+            menu.append(Gtk.SeparatorMenuItem())
+            for label, callback in plugin_items:
+                item = Gtk.MenuItem(label=label)
+                item.connect("activate", lambda widget, callback=callback: callback())
+                menu.append(item)
+
+        # Separator
+        menu.append(Gtk.SeparatorMenuItem())
+
+        # Quit item
+        quit_item = Gtk.MenuItem(label="Quit")
+        quit_item.connect("activate", self.app.quit)
+        menu.append(quit_item)
+
+        menu.show_all()
+        self.indicator.set_menu(menu)
+
+    def on_workspace_item_activate(self, widget, workspace):
+        self.app.switch_workspace(workspace)
+        if not self.is_visible:
+            self.toggle_window()
+        else:
+            self.app.present()
+
+    def toggle_window(self, widget=None):
+        if self.is_visible:
+            self.app.window.hide()
+            self.is_visible = False
+            self.show_hide_item.set_label("Show")
+        else:
+            self.app.present()
+            self.is_visible = True
+            self.show_hide_item.set_label("Hide")
+
+    def on_window_delete(self, widget, event):
+        # Hide window instead of closing
+        self.toggle_window()
+        return True  # Prevent default close
+
+    def on_unread_changed(self):
+        # Merge unread state across workspaces
+        has_unread = any(workspace.has_unread for workspace in self.app.workspaces)
+        for workspace in self.app.workspaces:
+            item = self.workspace_items.get(workspace.slug)
+            if item:
+                item.set_label(f"{workspace.name} •" if workspace.has_unread else workspace.name)
+
+        if has_unread:
+            self.indicator.set_icon_full(TRAY_ICON_UNREAD, "Unread messages")
+        else:
+            self.indicator.set_icon_full(TRAY_ICON, "No unread messages")
+
+PLUGIN = TrayPlugin
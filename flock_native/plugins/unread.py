@@ -0,0 +1,80 @@
+from gi.repository import GLib
+
+from . import Plugin
+
+UNREAD_CHECK_SCRIPT = """
+(function() {
+    // Check for unread badge in title
+    const titleMatch = document.title.match(/\\((\\d+)\\)/);
+    if (titleMatch) {
+        return parseInt(titleMatch[1]) > 0;
+    }
+
+    // Check for unread indicators in DOM
+    const unreadDots = document.querySelectorAll('.unread-dot, .unread-indicator, .badge-count');
+    if (unreadDots.length > 0) {
+        return true;
+    }
+
+    // Check for notification count in sidebar
+    const notificationBadges = document.querySelectorAll('[class*="notification"], [class*="unread"], [class*="badge"]');
+    for (let badge of notificationBadges) {
+        const text = badge.textContent.trim();
+        if (text && !isNaN(text) && parseInt(text) > 0) {
+            return true;
+        }
+    }
+
+    return false;
+})();
+"""
+
+class UnreadPlugin(Plugin):
+    """Polls every loaded workspace for unread messages"""
+    def __init__(self, app, options):
+        super().__init__(app, options)
+        self.interval = options.get("interval", 2)
+        self.monitor_started = False
+
+    def on_load_finished(self, webview, workspace):
+        # Start the unread monitor only after a page has fully loaded
+        if self.monitor_started:
+            return
+        self.monitor_started = True
+
+        # Poll from the main loop; WebViews must only be touched on the GTK
+        # thread, where they can't be destroyed while being polled
+        GLib.timeout_add_seconds(5, self.start_monitor)  # Wait for page to load initially
+
+    def start_monitor(self):
+        GLib.timeout_add(int(self.interval * 1000), self.check_unread_messages)
+        self.check_unread_messages()
+        return False
+
+    def check_unread_messages(self):
+        for workspace in self.app.workspaces:
+            webview = workspace.webview
+            if webview is None:
+                continue  # Suspended workspaces keep their last known state
+            try:
+                webview.evaluate_javascript(UNREAD_CHECK_SCRIPT, -1, None, None, None,
+                                            self.on_unread_check_finished, workspace)
+            except:
+                pass  # Page might be loading
+        return True
+
+    def on_unread_check_finished(self, webview, result, workspace):
+        try:
+            # Use the new method for WebKit2 4.0
+            value = webview.evaluate_javascript_finish(result)
+            has_unread = value.to_boolean() if value else False
+        except:
+            return
+        if webview is not workspace.webview:
+            return  # Suspended while the check was running
+
+        if has_unread != workspace.has_unread:
+            workspace.has_unread = has_unread
+            self.app.unread_changed()
+
+PLUGIN = UnreadPlugin
@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import time
+
+ACTIONS = ("show", "drop", "silent", "urgent", "digest")
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+WORD_CHAR = re.compile(r'\w')
+
+def parse_hours(value):
+    """"22:00-07:00" -> (1320, 420) in minutes after midnight"""
+    start, end = value.split("-")
+    minutes = []
+    for part in (start, end):
+        hours, _, mins = part.strip().partition(":")
+        minutes.append(int(hours) * 60 + int(mins or 0))
+    return tuple(minutes)
+
+def term_pattern(terms):
+    """One case-insensitive alternation for a set of literal terms, longest
+    first so that a match is the longest term starting at that position"""
+    ordered = sorted(terms, key=len, reverse=True)
+    return re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(term) for term in ordered) + r')(?!\w)',
+                      re.IGNORECASE)
+
+def shorter_terms(terms):
+    """Map each term to the other terms that match wherever it matches, i.e.
+    its prefixes that end at a word boundary ("deploy" for "deploy failed")"""
+    result = {}
+    for term in terms:
+        prefixes = [term[:end] for end in range(1, len(term))
+                    if term[:end] in terms and not WORD_CHAR.match(term[end])]
+        if prefixes:
+            result[term] = prefixes
+    return result
+
+def term_list(entry, key):
+    """A list of casefolded terms; a single string counts as one term"""
+    value = entry.get(key, [])
+    if isinstance(value, str):
+        value = [value]
+    return [term.casefold() for term in value]
+
+class Rule:
+    def __init__(self, index, entry):
+        if not isinstance(entry, dict):
+            raise TypeError(f"expected an object, got {entry!r}")
+        self.index = index
+        self.name = entry.get("name") or f"Rule {index + 1}"
+        self.action = entry.get("action", "show")
+        if self.action not in ACTIONS:
+            raise ValueError(f"unknown action {self.action!r}")
+
+        self.senders = term_list(entry, "sender")
+        self.channels = [c.lstrip('#') for c in term_list(entry, "channel")]
+        self.keywords = term_list(entry, "keywords")
+        self.regex = re.compile(entry["regex"], re.IGNORECASE) if entry.get("regex") else None
+        self.hours = parse_hours(entry["hours"]) if entry.get("hours") else None
+        days = entry.get("days")
+        if isinstance(days, str):
+            days = [days]
+        self.days = {DAYS.index(day.lower()[:3]) for day in days} if days else None
+
+    def matches_time(self, now):
+        if self.days is not None and now.tm_wday not in self.days:
+            return False
+        if self.hours is not None:
+            minute = now.tm_hour * 60 + now.tm_min
+            start, end = self.hours
+            if start <= end:
+                return start <= minute < end
+            # Window wraps past midnight
+            return minute >= start or minute < end
+        return True
+
+class RuleSet:
+    """Notification rules compiled into a few combined regexes.
+
+    Sender and channel terms are matched against the notification title,
+    keywords against title and body. All sender, channel and keyword terms
+    are folded into one alternation per field, so evaluating a notification
+    costs a handful of regex scans plus a check of the few rules whose terms
+    were found, no matter how many rules there are. The first matching rule
+    in file order decides the action.
+    """
+    def __init__(self, entries=()):
+        self.rules = []
+        for index, entry in enumerate(entries):
+            try:
+                self.rules.append(Rule(index, entry))
+            except (KeyError, ValueError, TypeError, re.error) as e:
+                print(f"Warning: Skipping notification rule {index + 1}: {e}")
+        self.hits = [0] * len(self.rules)
+
+        self.sender_terms = {}
+        self.channel_terms = {}
+        self.text_terms = {}
+        for position, rule in enumerate(self.rules):
+            for term in rule.senders:
+                self.sender_terms.setdefault(term, set()).add(position)
+            for term in rule.channels:
+                self.channel_terms.setdefault(term, set()).add(position)
+            for term in rule.keywords:
+                self.text_terms.setdefault(term, set()).add(position)
+        title_terms = set(self.sender_terms) | set(self.channel_terms)
+        self.title_pattern = term_pattern(title_terms) if title_terms else None
+        self.text_pattern = term_pattern(self.text_terms) if self.text_terms else None
+        self.shorter_terms = shorter_terms(title_terms | set(self.text_terms))
+        self.uses_time = any(rule.hours or rule.days is not None for rule in self.rules)
+
+        # Rules without terms have to be checked for every notification; the
+        # rest only when one of their terms was found
+        self.always_checked = {
+            position for position, rule in enumerate(self.rules)
+            if not (rule.senders or rule.channels or rule.keywords)
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Read rules.json; a missing or broken file gives an empty rule set"""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path) as f:
+                entries = json.load(f).get("rules", [])
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Warning: Could not read {path}: {e}")
+            return cls()
+        if not isinstance(entries, list):
+            print(f"Warning: Could not read {path}: \"rules\" must be a list")
+            return cls()
+        return cls(entries)
+
+    def evaluate(self, title, body, now=None):
+        """Return (action, rule) for a notification; rule is None for the default"""
+        if not self.rules:
+            return "show", None
+
+        title = title or ""
+        body = body or ""
+        # Terms are casefolded, so the text has to be too: "straße" is
+        # stored as "strasse" and must match "Straße"
+        folded_title = title.casefold()
+        sender_hits = set()
+        channel_hits = set()
+        if self.title_pattern:
+            for term in self.find_terms(self.title_pattern, folded_title):
+                sender_hits |= self.sender_terms.get(term, set())
+                channel_hits |= self.channel_terms.get(term, set())
+        text_hits = set()
+        if self.text_pattern:
+            for term in self.find_terms(self.text_pattern, folded_title + "\n" + body.casefold()):
+                text_hits |= self.text_terms.get(term, set())
+        if self.uses_time and now is None:
+            now = time.localtime()
+
+        candidates = self.always_checked | sender_hits | channel_hits | text_hits
+        for position in sorted(candidates):
+            rule = self.rules[position]
+            if rule.senders and position not in sender_hits:
+                continue
+            if rule.channels and position not in channel_hits:
+                continue
+            if rule.keywords and position not in text_hits:
+                continue
+            if rule.regex and not rule.regex.search(body):
+                continue
+            if (rule.hours or rule.days is not None) and not rule.matches_time(now):
+                continue
+            self.hits[position] += 1
+            return rule.action, rule
+        return "show", None
+
+    def find_terms(self, pattern, text):
+        """Every term that occurs in the casefolded text.
+
+        Searching again right after each match start finds terms inside a
+        longer match; the shorter terms starting at the same position come
+        from the precomputed prefixes.
+        """
+        found = set()
+        match = pattern.search(text)
+        while match:
+            term = match.group()
+            found.add(term)
+            found.update(self.shorter_terms.get(term, ()))
+            match = pattern.search(text, match.start() + 1)
+        return found
+
+    def hit_counts(self):
+        return [(rule.name, rule.action, hits) for rule, hits in zip(self.rules, self.hits)]
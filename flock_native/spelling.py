@@ -0,0 +1,72 @@
+import os
+import glob
+
+from .config import DATA_DIR
+from .languagetool import LANGUAGETOOL_DIR
+
+ENCHANT_DIR = os.path.join(DATA_DIR, "enchant")
+SYSTEM_DICTIONARY_DIRS = ("/usr/share/hunspell", "/usr/share/myspell", "/usr/share/myspell/dicts")
+
+def bundled_dictionaries(directory=LANGUAGETOOL_DIR):
+    """Return {language: .dic path} for the Hunspell dictionaries LanguageTool ships"""
+    found = {}
+    pattern = os.path.join(directory, "org", "languagetool", "resource", "*", "hunspell", "*.dic")
+    for dic in sorted(glob.glob(pattern)):
+        if os.path.exists(dic[:-4] + ".aff"):
+            found[os.path.basename(dic)[:-4]] = dic
+    return found
+
+def user_enchant_dir(private_dir=ENCHANT_DIR):
+    configured = os.environ.get("ENCHANT_CONFIG_DIR")
+    if configured and configured != private_dir:
+        return configured
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config_home, "enchant")
+
+def link_entries(source, target):
+    """Symlink every file in source into target unless target has it already"""
+    if not os.path.isdir(source):
+        return
+    for name in os.listdir(source):
+        path = os.path.join(source, name)
+        link = os.path.join(target, name)
+        if os.path.isfile(path) and not os.path.lexists(link):
+            os.symlink(path, link)
+
+def prepare_enchant(directory=ENCHANT_DIR):
+    """Make the bundled dictionaries visible to enchant, which WebKit uses for
+    spell checking, and return the languages that have a dictionary.
+
+    enchant only looks for Hunspell dictionaries in its config dir and the
+    system dirs, so this builds a private config dir that links the user's
+    own enchant files (personal word lists, extra dictionaries) plus the
+    bundled dictionaries, and points ENCHANT_CONFIG_DIR at it. Must run before
+    the first WebContext is created.
+    """
+    hunspell_dir = os.path.join(directory, "hunspell")
+    os.makedirs(hunspell_dir, exist_ok=True)
+
+    # Links are rebuilt on every start so moved or removed files don't linger
+    for folder in (directory, hunspell_dir):
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if os.path.islink(path):
+                os.unlink(path)
+
+    user_dir = user_enchant_dir(directory)
+    link_entries(user_dir, directory)
+    link_entries(os.path.join(user_dir, "hunspell"), hunspell_dir)
+    for language, dic in bundled_dictionaries().items():
+        # The user's own dictionary for a language wins over the bundled one
+        if os.path.lexists(os.path.join(hunspell_dir, language + ".dic")):
+            continue
+        for path in (dic, dic[:-4] + ".aff"):
+            os.symlink(path, os.path.join(hunspell_dir, os.path.basename(path)))
+
+    os.environ["ENCHANT_CONFIG_DIR"] = directory
+
+    languages = set()
+    for folder in (hunspell_dir,) + SYSTEM_DICTIONARY_DIRS:
+        for dic in glob.glob(os.path.join(folder, "*.dic")):
+            languages.add(os.path.basename(dic)[:-4])
+    return languages
@@ -0,0 +1,42 @@
+import os
+import re
+
+from .config import DATA_DIR, CACHE_DIR
+
+DEFAULT_SUSPEND_AFTER = 15 * 60  # Seconds before an inactive workspace is unloaded
+
+class Workspace:
+    """A Flock team with its own cookies and storage"""
+    def __init__(self, name, isolated=True):
+        self.name = name
+        self.slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or "workspace"
+        if isolated:
+            self.data_dir = os.path.join(DATA_DIR, "workspaces", self.slug)
+            self.cache_dir = os.path.join(CACHE_DIR, "workspaces", self.slug)
+        else:
+            self.data_dir = None
+            self.cache_dir = None
+        self.context = None
+        self.webview = None
+        self.container = None
+        self.suspend_source = None
+        self.has_unread = False
+        self.popouts = []
+
+def load_workspaces(config):
+    """Build workspaces from the "workspaces" list in config.json"""
+    names = [entry.get("name") for entry in config.get("workspaces", []) if entry.get("name")]
+    if not names:
+        names = ["Flock"]
+
+    # The first workspace uses the default storage, the rest get their own
+    workspaces = []
+    for index, name in enumerate(names):
+        workspace = Workspace(name, isolated=index > 0)
+        if any(other.slug == workspace.slug for other in workspaces):
+            print(f"Warning: Skipping duplicate workspace: {name}")
+            continue
+        workspaces.append(workspace)
+
+    suspend_after = config.get("suspend_after", DEFAULT_SUSPEND_AFTER)
+    return workspaces, suspend_after
@@ -0,0 +1,52 @@
+import re
+
+from flock_native.grammar_client import GrammarClient, split_sentences, utf16_len
+
+class FakeClient(GrammarClient):
+    """Reports every "teh" like LanguageTool would, with UTF-16 offsets"""
+    def __init__(self):
+        super().__init__("http://127.0.0.1:8081")
+        self.requests = []
+
+    def post(self, fields):
+        text = fields["text"]
+        self.requests.append(text)
+        return {"matches": [
+            {"offset": utf16_len(text[:m.start()]), "length": 3,
+             "message": "Possible typo", "replacements": [{"value": "the"}]}
+            for m in re.finditer("teh", text)
+        ]}
+
+def utf16_slice(text, offset, length):
+    data = text.encode('utf-16-le')
+    return data[offset * 2:(offset + length) * 2].decode('utf-16-le')
+
+def sentences(text):
+    return [sentence for _, sentence in split_sentences(text)]
+
+def test_split_sentences():
+    assert sentences("Hello there. How are you?") == ["Hello there.", "How are you?"]
+    assert sentences("line one\nline two") == ["line one", "line two"]
+
+def test_abbreviations_and_lowercase_do_not_split():
+    assert sentences("e.g. this is it.") == ["e.g. this is it."]
+    assert sentences("I met Dr. Smith. He left.") == ["I met Dr. Smith.", "He left."]
+    assert sentences("Really? no way.") == ["Really? no way."]
+
+def test_offsets_round_trip():
+    client = FakeClient()
+    text = "Fix teh bug 🐛. See e.g. teh docs.\n\nThen 🎉 teh end."
+    matches = client.check(text, "en-US")
+    assert len(matches) == 3
+    for match in matches:
+        assert utf16_slice(text, match["offset"], match["length"]) == "teh"
+
+def test_only_changed_sentences_are_sent():
+    client = FakeClient()
+    client.check("One teh. Two. Three teh.", "en-US")
+    assert len(client.requests) == 1
+
+    text = "One teh. Two changed. Three teh."
+    matches = client.check(text, "en-US")
+    assert client.requests[-1] == "Two changed."
+    assert [utf16_slice(text, m["offset"], m["length"]) for m in matches] == ["teh", "teh"]
@@ -0,0 +1,42 @@
+import time
+import sqlite3
+
+from flock_native.history import NotificationHistory
+
+def fill(path, count, age_days=0, **options):
+    """One app session: add count notifications, then shut down"""
+    history = NotificationHistory(path, **options)
+    timestamp = time.time() - age_days * 86400
+    for i in range(count):
+        history.add(f"Sender {i}", f"message number {i}", timestamp=timestamp + i)
+    history.close()
+
+def rows(path):
+    connection = sqlite3.connect(path)
+    result = connection.execute("SELECT title FROM notifications ORDER BY id").fetchall()
+    connection.close()
+    return [title for title, in result]
+
+def test_search_finds_prefixes(tmp_path):
+    path = str(tmp_path / "history.db")
+    fill(path, 3)
+    history = NotificationHistory(path)
+    results = history.search("numb 2")
+    history.close()
+    assert [title for _, _, title, _ in results] == ["Sender 2"]
+
+def test_max_entries_is_enforced_across_short_sessions(tmp_path):
+    path = str(tmp_path / "history.db")
+    for _ in range(3):
+        fill(path, 50, max_entries=5)
+    # Each session prunes what the previous ones left when it starts
+    assert len(rows(path)) == 55
+    NotificationHistory(path, max_entries=5).close()
+    assert rows(path) == [f"Sender {i}" for i in range(45, 50)]
+
+def test_old_entries_are_pruned_on_start(tmp_path):
+    path = str(tmp_path / "history.db")
+    for _ in range(3):
+        fill(path, 50, age_days=10, max_age_days=1)
+    NotificationHistory(path, max_age_days=1).close()
+    assert rows(path) == []
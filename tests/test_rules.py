@@ -0,0 +1,75 @@
+import time
+
+from flock_native.rules import RuleSet
+
+def action(rules, title, body=""):
+    return RuleSet(rules).evaluate(title, body)[0]
+
+def test_no_rules_shows():
+    assert action([], "Alice", "hi") == "show"
+
+def test_first_matching_rule_wins_when_terms_overlap():
+    rules = [
+        {"keywords": ["deploy"], "action": "drop"},
+        {"keywords": ["deploy failed"], "action": "urgent"},
+    ]
+    assert action(rules, "ci", "deploy failed") == "drop"
+    assert action(list(reversed(rules)), "ci", "deploy failed") == "urgent"
+    assert action(list(reversed(rules)), "ci", "deploy done") == "drop"
+
+def test_sender_inside_longer_channel_term():
+    rules = [
+        {"sender": ["alice"], "action": "drop"},
+        {"channel": ["alice smith"], "action": "urgent"},
+    ]
+    assert action(rules, "Alice Smith", "hi") == "drop"
+
+def test_terms_inside_a_longer_match():
+    rules = [{"keywords": ["failed"], "action": "urgent"}, {"keywords": ["deploy failed"], "action": "drop"}]
+    assert action(rules, "ci", "Deploy failed") == "urgent"
+
+def test_sender_and_channel_must_both_match():
+    rules = [{"sender": ["bob"], "channel": ["#ops"], "action": "drop"}]
+    assert action(rules, "Bob in ops", "x") == "drop"
+    assert action(rules, "Bob in dev", "x") == "show"
+
+def test_whole_words_only():
+    assert action([{"keywords": ["test"], "action": "drop"}], "x", "testing") == "show"
+
+def test_case_folding_does_not_crash():
+    assert action([{"keywords": ["test"], "action": "drop"}], "x", "teſt") == "drop"
+    assert action([{"sender": ["STRASSE"], "action": "drop"}], "strasse", "") == "drop"
+
+def test_non_ascii_case_folding():
+    rules = [{"keywords": ["straße"], "action": "drop"}]
+    assert action(rules, "x", "Straße") == "drop"
+    assert action(rules, "x", "STRASSE") == "drop"
+    assert action([{"sender": ["Ωmega"], "action": "drop"}], "ωMEGA team", "") == "drop"
+
+def test_single_string_is_one_term():
+    rules = [{"sender": "bob", "action": "drop"}]
+    assert action(rules, "b", "x") == "show"
+    assert action(rules, "Bob", "x") == "drop"
+
+def test_regex_and_hours():
+    rules = [{"regex": "lunch\\s+order", "hours": "22:00-07:00", "action": "silent"}]
+    night = time.strptime("2026-10-19 23:30", "%Y-%m-%d %H:%M")
+    noon = time.strptime("2026-10-19 12:00", "%Y-%m-%d %H:%M")
+    ruleset = RuleSet(rules)
+    assert ruleset.evaluate("x", "Lunch  order?", night)[0] == "silent"
+    assert ruleset.evaluate("x", "Lunch  order?", noon)[0] == "show"
+
+def test_invalid_rules_are_skipped():
+    ruleset = RuleSet([{"action": "explode"}, {"regex": "(", "action": "drop"}, {"keywords": ["x"]}])
+    assert len(ruleset.rules) == 1
+
+def test_entries_that_are_not_objects_are_skipped():
+    ruleset = RuleSet(["drop bob", {"sender": ["bob"], "action": "drop"}, 3])
+    assert len(ruleset.rules) == 1
+    assert ruleset.evaluate("Bob", "hi")[0] == "drop"
+
+def test_load_survives_bad_files(tmp_path):
+    path = tmp_path / "rules.json"
+    for content in ('{"rules": ["drop bob"]}', '{"rules": "x"}', '["x"]', '{'):
+        path.write_text(content)
+        assert RuleSet.load(str(path)).evaluate("Bob", "hi")[0] == "show"